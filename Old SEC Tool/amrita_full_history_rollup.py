@@ -33,48 +33,79 @@ USAGE
 """
 
 import argparse
+import bisect
+import gzip
+import io
+import json
 import os
 import re
+import threading
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-import pandas as pd
-import requests
-from lxml import etree
+try:  # 2-4x faster decode for the multi-MB SEC submissions payloads
+    import orjson
 
-try:
-    from src.parse_form4 import parse_transactions as _parse_transactions_new
+    _json_loads = orjson.loads
 except ModuleNotFoundError:
-    import importlib.util as _ilu
-    import os as _os
-    import sys as _sys
-    import types as _types
-
-    _root = _os.path.dirname(__file__)
-    _src_dir = _os.path.join(_root, "src")
-
-    # Seed package context for relative imports inside src.* modules
-    if "src" not in _sys.modules:
-        _pkg = _types.ModuleType("src")
-        _pkg.__path__ = [_src_dir]  # type: ignore[attr-defined]
-        _sys.modules["src"] = _pkg
-
-    # Preload src.classify
-    _classify_path = _os.path.join(_src_dir, "classify.py")
-    _spec_c = _ilu.spec_from_file_location("src.classify", _classify_path)
-    assert _spec_c and _spec_c.loader
-    _mod_c = _ilu.module_from_spec(_spec_c)
-    _spec_c.loader.exec_module(_mod_c)  # type: ignore[attr-defined]
-    _sys.modules["src.classify"] = _mod_c
-
-    # Load src.parse_form4 (which imports .classify)
-    _parse_path = _os.path.join(_src_dir, "parse_form4.py")
-    _spec_p = _ilu.spec_from_file_location("src.parse_form4", _parse_path)
-    assert _spec_p and _spec_p.loader
-    _mod_p = _ilu.module_from_spec(_spec_p)
-    _spec_p.loader.exec_module(_mod_p)  # type: ignore[attr-defined]
-    _parse_transactions_new = _mod_p.parse_transactions  # type: ignore[attr-defined]
+    _json_loads = json.loads
+
+# pandas / requests / lxml are imported lazily (inside the functions that
+# need them) so `--check-only` and no-op `update` runs skip ~0.5 s of
+# import cost; see _load_parse_transactions for the parser module.
+
+_parse_transactions_new = None
+
+
+def _load_parse_transactions():
+    """Resolve src.parse_form4.parse_transactions on first use.
+
+    Deferred because importing the parser pulls in pandas/lxml, which the
+    enumerate-only code paths never need.
+    """
+    global _parse_transactions_new
+    if _parse_transactions_new is not None:
+        return _parse_transactions_new
+
+    try:
+        from src.parse_form4 import parse_transactions
+    except ModuleNotFoundError:
+        import importlib.util as _ilu
+        import os as _os
+        import sys as _sys
+        import types as _types
+
+        _root = _os.path.dirname(__file__)
+        _src_dir = _os.path.join(_root, "src")
+
+        # Seed package context for relative imports inside src.* modules
+        if "src" not in _sys.modules:
+            _pkg = _types.ModuleType("src")
+            _pkg.__path__ = [_src_dir]  # type: ignore[attr-defined]
+            _sys.modules["src"] = _pkg
+
+        # Preload src.classify
+        _classify_path = _os.path.join(_src_dir, "classify.py")
+        _spec_c = _ilu.spec_from_file_location("src.classify", _classify_path)
+        assert _spec_c and _spec_c.loader
+        _mod_c = _ilu.module_from_spec(_spec_c)
+        _spec_c.loader.exec_module(_mod_c)  # type: ignore[attr-defined]
+        _sys.modules["src.classify"] = _mod_c
+
+        # Load src.parse_form4 (which imports .classify)
+        _parse_path = _os.path.join(_src_dir, "parse_form4.py")
+        _spec_p = _ilu.spec_from_file_location("src.parse_form4", _parse_path)
+        assert _spec_p and _spec_p.loader
+        _mod_p = _ilu.module_from_spec(_spec_p)
+        _spec_p.loader.exec_module(_mod_p)  # type: ignore[attr-defined]
+        parse_transactions = _mod_p.parse_transactions  # type: ignore[attr-defined]
+
+    _parse_transactions_new = parse_transactions
+    return parse_transactions
 
 # ---------------- Config ---------------- #
 UA = {
@@ -82,7 +113,8 @@ UA = {
 }  # <- set your email
 BASE = "https://www.sec.gov"
 TIMEOUT = 20
-SLEEP_SEC = 0.20
+MAX_WORKERS = 8  # concurrent fetches; actual rate is bounded by RateLimiter
+SEC_MAX_REQ_PER_SEC = 10  # SEC fair-access cap
 XML_CACHE_DIR = "xml_cache"
 BLOCK_CIK10 = "0001512673"  # Block, Inc. (Square)
 
@@ -102,32 +134,131 @@ ISSUER_RE = re.compile(
 )
 ISO_D = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
 MDY_S = re.compile(
-    r"\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2},\s*\d{4}\b",
+    r"\b(?P<mon>Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+(?P<day>\d{1,2}),\s*(?P<yr>\d{4})\b",
     re.IGNORECASE,
 )
 NUM_MDY = re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{4})\b")
+ADOPT_RE = re.compile(r"(adopt(?:ed|ion)?|entered\s+into)", re.IGNORECASE)
+
+# Month lookup keyed on the first three letters; MDY_S already guarantees an
+# English month name, so strptime's locale/format machinery is unnecessary.
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+def _looks_iso_prefix(s: str) -> bool:
+    """Cheap check for a leading YYYY-MM-DD before paying for a regex search."""
+    return (
+        len(s) >= 10
+        and s[4] == "-"
+        and s[7] == "-"
+        and s[:4].isdigit()
+        and s[5:7].isdigit()
+        and s[8:10].isdigit()
+    )
 
 
 # ---------------- HTTP helpers ---------------- #
+class RateLimiter:
+    """Sliding-window limiter keeping us under SEC's requests-per-second cap.
+
+    Thread-safe: fetch workers share one instance so aggregate request rate
+    stays bounded no matter how many threads are in flight.
+    """
+
+    def __init__(self, max_calls: int, per_seconds: float = 1.0):
+        self.max_calls = max_calls
+        self.per_seconds = per_seconds
+        self._calls: deque = deque()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.per_seconds:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                delay = self.per_seconds - (now - self._calls[0])
+            time.sleep(max(delay, 0.0))
+
+
+RATE_LIMITER = RateLimiter(SEC_MAX_REQ_PER_SEC)
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session():
+    """Build the pooled/retrying session on first request (lazy requests import)."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                session = requests.Session()
+                session.headers.update(UA)
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=MAX_WORKERS * 2,
+                    max_retries=Retry(
+                        total=3,
+                        backoff_factor=0.3,
+                        status_forcelist=[429, 500, 502, 503, 504],
+                    ),
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _SESSION = session
+    return _SESSION
+
+
 def fetch_text(url: str) -> Optional[str]:
+    import requests
+
+    RATE_LIMITER.wait()
     try:
-        r = requests.get(url, headers=UA, timeout=TIMEOUT)
+        r = _get_session().get(url, timeout=TIMEOUT)
         return r.text if r.ok else None
     except requests.RequestException:
         return None
 
 
+def fetch_bytes(url: str) -> Optional[bytes]:
+    import requests
+
+    RATE_LIMITER.wait()
+    try:
+        r = _get_session().get(url, timeout=TIMEOUT)
+        return r.content if r.ok else None
+    except requests.RequestException:
+        return None
+
+
 def fetch_json(url: str) -> Optional[dict]:
+    import requests
+
+    RATE_LIMITER.wait()
     try:
-        r = requests.get(url, headers=UA, timeout=TIMEOUT)
-        return r.json() if r.ok else None
+        r = _get_session().get(url, timeout=TIMEOUT)
+        # orjson.JSONDecodeError subclasses ValueError, as does json's
+        return _json_loads(r.content) if r.ok else None
     except (requests.RequestException, ValueError):
         return None
 
 
 def head_ok(url: str) -> bool:
+    import requests
+
+    RATE_LIMITER.wait()
     try:
-        r = requests.head(url, headers=UA, timeout=TIMEOUT, allow_redirects=True)
+        r = _get_session().head(url, timeout=TIMEOUT, allow_redirects=True)
         return r.ok
     except requests.RequestException:
         return False
@@ -141,86 +272,139 @@ def list_all_form4_filings(cik10: str) -> List[Dict]:
         return rows
 
     def harvest(rec: dict):
-        forms = rec.get("form", [])
-        acc = rec.get("accessionNumber", [])
-        prim = rec.get("primaryDocument", [])
-        filed = rec.get("filingDate", [])
-        for i, f in enumerate(forms):
+        # zip the parallel arrays instead of indexing each list by position
+        for f, a, p, d in zip(
+            rec.get("form", []),
+            rec.get("accessionNumber", []),
+            rec.get("primaryDocument", []),
+            rec.get("filingDate", []),
+        ):
             if f in ("4", "4/A"):
-                rows.append(
-                    {"accession": acc[i], "primary": prim[i], "filed_at": filed[i]}
-                )
+                rows.append({"accession": a, "primary": p, "filed_at": d})
 
     harvest(root.get("filings", {}).get("recent", {}))
-    for f in root.get("filings", {}).get("files", []):
-        older = fetch_json(f"https://data.sec.gov/submissions/{f.get('name')}")
-        if older:
-            harvest(older.get("filings", {}).get("recent", {}))
-
-    seen, uniq = set(), []
-    for r in sorted(rows, key=lambda x: x["filed_at"], reverse=True):
-        if r["accession"] in seen:
-            continue
-        seen.add(r["accession"])
-        uniq.append(r)
-    return list(reversed(uniq))
+    names = [
+        f.get("name") for f in root.get("filings", {}).get("files", []) if f.get("name")
+    ]
+    if names:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            pages = pool.map(
+                lambda n: fetch_json(f"https://data.sec.gov/submissions/{n}"), names
+            )
+            for older in pages:
+                if older:
+                    harvest(older.get("filings", {}).get("recent", {}))
+
+    # Dedupe by accession (keep latest filed_at) in one pass, then a single
+    # ascending sort — replaces the old sort-desc / dedupe / reverse dance.
+    best: Dict[str, Dict] = {}
+    for r in rows:
+        cur = best.get(r["accession"])
+        if cur is None or r["filed_at"] > cur["filed_at"]:
+            best[r["accession"]] = r
+    return sorted(best.values(), key=lambda x: x["filed_at"])
 
 
 # ---------------- Cache / fetch XML ---------------- #
-def cache_path(accession: str) -> str:
-    os.makedirs(XML_CACHE_DIR, exist_ok=True)
-    return os.path.join(XML_CACHE_DIR, f"{accession.replace('/', '_')}.xml")
+def cache_path(accession: str) -> Path:
+    cache_dir = Path(XML_CACHE_DIR)
+    cache_dir.mkdir(exist_ok=True)
+    return cache_dir / f"{accession.replace('/', '_')}.xml.gz"
+
+
+def index_cache_path(accession: str) -> Path:
+    cache_dir = Path(XML_CACHE_DIR)
+    cache_dir.mkdir(exist_ok=True)
+    return cache_dir / f"{accession.replace('/', '_')}.idx.json"
+
+
+def fetch_index_items(cik10: str, accession: str) -> Optional[List[dict]]:
+    """Directory listing (index.json items) for a filing, cached on disk.
+
+    Shared by XML discovery and document-URL resolution so each filing
+    costs at most one index.json round-trip across runs.
+    """
+    ip = index_cache_path(accession)
+    if ip.exists():
+        try:
+            return json.loads(ip.read_bytes())
+        except Exception:
+            pass
+    acc_path = accession.replace("-", "")
+    base_dir = f"{BASE}/Archives/edgar/data/{int(cik10)}/{acc_path}"
+    idx = fetch_json(f"{base_dir}/index.json")
+    if not idx:
+        return None
+    items = idx.get("directory", {}).get("item", [])
+    try:
+        ip.write_bytes(json.dumps(items).encode("utf-8"))
+    except Exception:
+        pass
+    return items
 
 
 def fetch_xml_for_accession(
     cik10: str, accession: str, primary: str
-) -> Tuple[Optional[str], bool]:
+) -> Tuple[Optional[bytes], bool, Optional[List[dict]]]:
+    """Return (xml_bytes, from_cache, index_items).
+
+    XML is cached gzipped and handled as raw bytes end to end; lxml takes
+    the bytes directly so there is no decode/re-encode round-trip.
+    index_items is the filing's directory listing when it was needed for
+    discovery (None otherwise); callers pass it to form4_doc_url to avoid
+    re-fetching index.json.
+    """
     cp = cache_path(accession)
-    if os.path.exists(cp):
+    if cp.exists():
         try:
-            txt = open(cp, "r", encoding="utf-8").read()
-            if txt and "<ownershipDocument" in txt:
-                return txt, True
+            with gzip.open(cp, "rb") as fh:
+                data = fh.read()
+            if data and b"<ownershipDocument" in data:
+                return data, True, None
         except Exception:
             pass
 
     acc_path = accession.replace("-", "")
     base_dir = f"{BASE}/Archives/edgar/data/{int(cik10)}/{acc_path}"
 
-    txt = fetch_text(f"{base_dir}/{primary}")
-    if txt and txt.strip().startswith("<") and "<ownershipDocument" in txt:
+    data = fetch_bytes(f"{base_dir}/{primary}")
+    if data and data.strip().startswith(b"<") and b"<ownershipDocument" in data:
         try:
-            open(cp, "w", encoding="utf-8").write(txt)
+            with gzip.open(cp, "wb") as fh:
+                fh.write(data)
         except Exception:
             pass
-        return txt, False
+        return data, False, None
 
-    idx = fetch_json(f"{base_dir}/index.json")
-    if idx:
-        for it in idx.get("directory", {}).get("item", []):
+    items = fetch_index_items(cik10, accession)
+    if items:
+        for it in items:
             nm = it.get("name", "").lower()
             if nm.endswith(".xml"):
-                cand = fetch_text(f"{base_dir}/{it['name']}")
+                cand = fetch_bytes(f"{base_dir}/{it['name']}")
                 if (
                     cand
-                    and cand.strip().startswith("<")
-                    and "<ownershipDocument" in cand
+                    and cand.strip().startswith(b"<")
+                    and b"<ownershipDocument" in cand
                 ):
                     try:
-                        open(cp, "w", encoding="utf-8").write(cand)
+                        with gzip.open(cp, "wb") as fh:
+                            fh.write(cand)
                     except Exception:
                         pass
-                    return cand, False
-    return None, False
+                    return cand, False, items
+    return None, False, items
 
 
-def form4_doc_url(cik10: str, accession: str) -> str:
+def form4_doc_url(
+    cik10: str, accession: str, items: Optional[List[dict]] = None
+) -> str:
     acc_path = accession.replace("-", "")
     base_dir = f"{BASE}/Archives/edgar/data/{int(cik10)}/{acc_path}"
-    idx = fetch_json(f"{base_dir}/index.json")
+    if items is None:
+        items = fetch_index_items(cik10, accession)
     html_candidate = xml_candidate = None
-    if idx:
-        items = idx.get("directory", {}).get("item", [])
+    if items:
         for it in items:
             nm = it.get("name", "")
             nml = nm.lower()
@@ -259,6 +443,8 @@ def iso_date_from_mdy(txt: str) -> Optional[str]:
     if not txt:
         return None
     s = txt.strip()
+    if _looks_iso_prefix(s):
+        return s[:10]
     m = ISO_D.search(s)
     if m:
         return s[:10]
@@ -271,11 +457,15 @@ def iso_date_from_mdy(txt: str) -> Optional[str]:
             return None
     m = MDY_S.search(s)
     if m:
-        token = m.group(0)
-        for fmt in ("%B %d, %Y", "%b %d, %Y"):
+        mo = MONTHS.get(m.group("mon")[:3].lower())
+        if mo:
             try:
-                return datetime.strptime(token, fmt).date().isoformat()
-            except Exception:
+                return (
+                    datetime(int(m.group("yr")), mo, int(m.group("day")))
+                    .date()
+                    .isoformat()
+                )
+            except ValueError:
                 pass
     return None
 
@@ -309,6 +499,11 @@ def transaction_type_label_initial(
 
 def _parse_date_str(txt: str) -> Optional[str]:
     s = (txt or "").strip()
+    if _looks_iso_prefix(s):
+        try:
+            return datetime(int(s[:4]), int(s[5:7]), int(s[8:10])).date().isoformat()
+        except ValueError:
+            return None
     m = ISO_D.search(s)
     if m:
         y, mo, d = map(int, m.groups())
@@ -318,11 +513,15 @@ def _parse_date_str(txt: str) -> Optional[str]:
             return None
     m = MDY_S.search(s)
     if m:
-        token = m.group(0)
-        for fmt in ("%B %d, %Y", "%b %d, %Y"):
+        mo = MONTHS.get(m.group("mon")[:3].lower())
+        if mo:
             try:
-                return datetime.strptime(token, fmt).date().isoformat()
-            except Exception:
+                return (
+                    datetime(int(m.group("yr")), mo, int(m.group("day")))
+                    .date()
+                    .isoformat()
+                )
+            except ValueError:
                 pass
     m = NUM_MDY.search(s)
     if m:
@@ -334,27 +533,81 @@ def _parse_date_str(txt: str) -> Optional[str]:
     return None
 
 
+def _iter_dates_with_positions(txt: str):
+    """Yield (position, iso_date) for every date literal in txt."""
+    for m in ISO_D.finditer(txt):
+        y, mo, d = map(int, m.groups())
+        try:
+            yield m.start(), datetime(y, mo, d).date().isoformat()
+        except ValueError:
+            pass
+    for m in NUM_MDY.finditer(txt):
+        mm, dd, yyyy = map(int, m.groups())
+        try:
+            yield m.start(), datetime(yyyy, mm, dd).date().isoformat()
+        except ValueError:
+            pass
+    for m in MDY_S.finditer(txt):
+        mo = MONTHS.get(m.group("mon")[:3].lower())
+        if mo:
+            try:
+                yield m.start(), (
+                    datetime(int(m.group("yr")), mo, int(m.group("day")))
+                    .date()
+                    .isoformat()
+                )
+            except ValueError:
+                pass
+
+
 def find_adoption_date_in_text(txt: str) -> Optional[str]:
     if not txt:
         return None
-    hits = []
-    for m in re.finditer(
-        r"(adopt(?:ed|ion)?|entered\s+into)", txt, flags=re.IGNORECASE
-    ):
-        start = max(0, m.start() - 50)
-        end = min(len(txt), m.end() + 50)
-        d = _parse_date_str(txt[start:end])
-        if d:
-            hits.append(d)
+    adopt_hits = list(ADOPT_RE.finditer(txt))
+    if not adopt_hits:
+        return _parse_date_str(txt)
+
+    # Scan the text once for all dates, then attach each adoption mention to
+    # the dates inside its +/-50 char window by position — instead of
+    # re-running three date regexes per window.
+    dates = sorted(_iter_dates_with_positions(txt))
+    starts = [p for p, _ in dates]
+
+    hits: List[str] = []
+    for m in adopt_hits:
+        lo = bisect.bisect_left(starts, m.start() - 50)
+        hi = bisect.bisect_right(starts, m.end() + 50)
+        hits.extend(d for _, d in dates[lo:hi])
     if hits:
-        return sorted(hits)[0]
+        return min(hits)
     return _parse_date_str(txt)
 
 
 # ---------------- Parse a filing into SOURCE rows ---------------- #
 def parse_transactions(xml_text: str, insider_display: str) -> Tuple[List[Dict], int]:
     # Delegate to the migrated implementation to keep behavior in sync.
-    return _parse_transactions_new(xml_text, insider_display)
+    return _load_parse_transactions()(xml_text, insider_display)
+
+
+def _parse_worker(task: Tuple) -> Optional[Tuple[List[Dict], int, int]]:
+    """Parse one filing and build its roll-ups (runs in a worker process).
+
+    Returns (combined_rows, emitted_source_count, xml_txn_count), or None on
+    a parse failure so the caller can count it without killing the pool.
+    """
+    xml_bytes, acc, filed_iso, doc_url, display = task
+    try:
+        src_rows, xml_txn_count = parse_transactions(
+            xml_bytes.decode("utf-8"), insider_display=display
+        )
+        for r in src_rows:
+            r["Filed Date"] = filed_iso
+            r["Source"] = doc_url
+            r["accession"] = acc
+        combined = build_events_and_rollups(src_rows, accession=acc, filed_iso=filed_iso)
+        return combined, len(src_rows), xml_txn_count
+    except Exception:
+        return None
 
 
 # ---------------- Roll-up builder (with SPLIT logic) ---------------- #
@@ -366,21 +619,47 @@ def build_events_and_rollups(
     If last S would overshoot exercised amount, split into linked + residual.
     Upgrade linked planned S to "10b Planned Sale - Derivative"; residual stays as planned-common (or non-plan).
     """
-    exercises = [r for r in rows if r["LinkRole"] == "exercise"]
-    sales_common = [r for r in rows if r["LinkRole"] == "sale-common"]
-    tax_rows = [
-        r for r in rows if r["LinkRole"] in ("tax-sale-issuer", "tax-sale-open")
-    ]
+    import pandas as pd
+
+    exercises: List[Dict] = []
+    sales_common: List[Dict] = []
+    tax_rows: List[Dict] = []
+    for r in rows:
+        lr = r["LinkRole"]
+        if lr == "exercise":
+            exercises.append(r)
+        elif lr == "sale-common":
+            sales_common.append(r)
+        elif lr in ("tax-sale-issuer", "tax-sale-open"):
+            tax_rows.append(r)
 
     if not exercises:
         return rows
 
+    # Vectorized pre-pass: underlying Table-I "A" shares summed per trade date
+    # once, instead of re-scanning every row for each exercise date below.
+    df = pd.DataFrame(rows)
+    ad_mask = (~df["_is_derivative"].astype(bool)) & (
+        df["AcqDisp"].fillna("").str.upper() == "A"
+    )
+    underlying_by_date = (
+        pd.to_numeric(df.loc[ad_mask, "Transacted Shares"], errors="coerce")
+        .abs()
+        .groupby(df.loc[ad_mask, "Trade Date Range"])
+        .sum()
+        .to_dict()
+    )
+
     # group exercises by trade date
     ex_by_date: Dict[str, List[Dict]] = {}
     for r in exercises:
         ex_by_date.setdefault(r["Trade Date Range"], []).append(r)
 
     sales_pool = sorted(sales_common, key=lambda x: x["Trade Date Range"])
+    # Precompute per-sale magnitude and price once; indexes track sales_pool
+    # so the greedy loop below never redoes abs()/.get() per candidate.
+    pool_abs = [abs(s.get("Transacted Shares") or 0) or 0.0 for s in sales_pool]
+    pool_price = [s.get("Price Range ($)") for s in sales_pool]
     out: List[Dict] = []
     event_seq = 1
 
@@ -388,13 +667,7 @@ def build_events_and_rollups(
         ex_rows = ex_by_date[ex_date]
 
         # Exercise estimate: Method A (underlying A on date) -> Method B (sum abs(exercises))
-        underlying_A = sum(
-            abs(r["Transacted Shares"])
-            for r in rows
-            if (not r["_is_derivative"])
-            and (r.get("AcqDisp") or "").upper() == "A"
-            and r["Trade Date Range"] == ex_date
-        )
+        underlying_A = underlying_by_date.get(ex_date, 0.0)
         if underlying_A > 0:
             ex_est, ex_method = underlying_A, "UNDERLYING_A"
         else:
@@ -406,13 +679,13 @@ def build_events_and_rollups(
         linked_sales: List[Dict] = []
         sale_value_sum = 0.0
 
-        for s in sales_pool:
+        for j, s in enumerate(sales_pool):
             if s.get("_assigned_event"):
                 continue
             if s["Trade Date Range"] < ex_date:
                 continue
 
-            s_abs = abs(s.get("Transacted Shares") or 0) or 0.0
+            s_abs = pool_abs[j]
             if s_abs == 0:
                 # zero-amount sale row; do not link, leave as-is
                 continue
@@ -421,7 +694,7 @@ def build_events_and_rollups(
                 # Already satisfied; leave this sale as common-stock residual
                 continue
 
-            price = s.get("Price Range ($)")
+            price = pool_price[j]
             if s_abs <= remaining:
                 # fully link
                 s["_assigned_event"] = True  # original row becomes linked
@@ -434,7 +707,7 @@ def build_events_and_rollups(
                 linked_sales.append(s)
                 if price is not None:
                     try:
-                        sale_value_sum += float(s_abs) * float(price)
+                        sale_value_sum += s_abs * float(price)
                     except Exception:
                         pass
                 remaining -= s_abs
@@ -471,6 +744,7 @@ def build_events_and_rollups(
 
                 # mutate the original sale row into the residual piece (unlinked)
                 s["Transacted Shares"] = -residual_abs
+                pool_abs[j] = residual_abs  # keep precomputed magnitude in sync
                 if price is not None:
                     try:
                         s["Transaction Value Range ($)"] = float(residual_abs) * float(
@@ -512,7 +786,8 @@ def build_events_and_rollups(
                 [r.get("Price Range ($)") for r in ex_rows]
                 + [r.get("Price Range ($)") for r in linked_sales]
             )
-            if pd.notna(p)
+            # p == p filters NaN without a pd.notna ufunc dispatch per scalar
+            if p is not None and p == p
         ]
         price_min = min(prices) if prices else None
         price_max = max(prices) if prices else None
@@ -609,7 +884,18 @@ def build_events_and_rollups(
 
 
 # ---------------- Orchestrator ---------------- #
+def check_only():
+    """Enumerate filings and print the count without importing pandas/lxml."""
+    filings = list_all_form4_filings(BLOCK_CIK10)
+    print(f"[Check] {len(filings)} Form 4/4A filings for Block, Inc.")
+
+
 def run(mode: str, outfile: str):
+    import pandas as pd
+    from lxml import etree
+
+    xp_owner_name = etree.XPath("string(.//rptOwnerName)")
+
     filings = list_all_form4_filings(BLOCK_CIK10)
     total = len(filings)
     print(f"[Info] Enumerated {total} Form 4/4A filings for Block, Inc.")
@@ -628,107 +914,129 @@ def run(mode: str, outfile: str):
             print("[Update] Could not read existing CSV — doing full rebuild")
             mode = "full"
 
+    # Drop known accessions before any fetch/sleep/print happens for them
+    if mode == "update" and processed:
+        filings = [f for f in filings if f["accession"] not in processed]
+        total = len(filings)
+        print(f"[Update] {total} new filings to process")
+
     all_rows: List[Dict] = []
     skipped_no_xml = parse_errors = not_amrita = added = 0
 
+    # Prefetch XML concurrently (rate-limited); parse serially in filing order.
+    fetch_pool = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    xml_futures = {
+        f["accession"]: fetch_pool.submit(
+            fetch_xml_for_accession, BLOCK_CIK10, f["accession"], f["primary"]
+        )
+        for f in filings
+    }
+
+    # Stage 1 (I/O, threaded fetch): owner-filter filings and queue parse tasks.
+    tasks: List[Tuple] = []
     for i, f in enumerate(filings, 1):
-        acc, prim = f["accession"], f["primary"]
+        acc = f["accession"]
         tag = f"[{i}/{total}] {acc}"
-        if mode == "update" and acc in processed:
-            print(tag, "... skip (already in CSV)")
-            continue
 
-        xml_text, from_cache = fetch_xml_for_accession(BLOCK_CIK10, acc, prim)
-        if not xml_text:
+        xml_bytes, from_cache, index_items = xml_futures[acc].result()
+        if not xml_bytes:
             skipped_no_xml += 1
             print(tag, "... skip (no XML)")
-            time.sleep(SLEEP_SEC)
+            continue
+
+        # Byte-level pre-filter: if the name never appears in the raw XML it
+        # cannot be the reporting owner, so skip parsing entirely.
+        low = xml_bytes.lower()
+        if b"amrita" not in low or b"ahuja" not in low:
+            not_amrita += 1
+            print(tag, "... skip (owner not Amrita)")
             continue
 
         try:
-            root = etree.fromstring(xml_text.encode("utf-8"))
-            owners = [
-                (ro.findtext(".//rptOwnerName") or "").strip()
-                for ro in root.findall(".//reportingOwner")
-            ]
-            is_amrita = any(
-                "amrita" in n.lower() and "ahuja" in n.lower() for n in owners
-            )
+            # Stream only reportingOwner elements; most filings are rejected
+            # here, so avoid building the full DOM for the common path.
+            owners = []
+            is_amrita = False
+            for _, ro in etree.iterparse(
+                io.BytesIO(xml_bytes), tag="reportingOwner"
+            ):
+                n = xp_owner_name(ro).strip()
+                owners.append(n)
+                ro.clear()
+                if "amrita" in n.lower() and "ahuja" in n.lower():
+                    is_amrita = True
+                    break
             display = next((n for n in owners if "amrita" in n.lower()), "Amrita Ahuja")
             if not is_amrita:
                 not_amrita += 1
                 print(tag, "... skip (owner not Amrita)")
-                time.sleep(SLEEP_SEC)
                 continue
-
-            src_rows, xml_txn_count = parse_transactions(
-                xml_text, insider_display=display
-            )
-
-            doc_url = form4_doc_url(BLOCK_CIK10, acc)
-            filed_iso = iso_date_from_mdy(f["filed_at"]) or (f["filed_at"] or "")
-
-            # Fill per-row fields and count emitted SOURCE before roll-ups
-            for r in src_rows:
-                r["Filed Date"] = filed_iso
-                r["Source"] = doc_url
-                r["accession"] = acc
-
-            emitted_source = len(src_rows)
-            if emitted_source != xml_txn_count:
-                print(
-                    f"[WARN] {acc}: XML txns={xml_txn_count}, emitted={emitted_source}"
-                )
-                all_rows.append(
-                    {
-                        "RowTag": "SOURCE",
-                        "EventID": "",
-                        "LinkRole": "other",
-                        "Holder Name": display,
-                        "Trade Date Range": "",
-                        "Security Type": "",
-                        "Transacted Shares": None,
-                        "Transaction Value Range ($)": None,
-                        "Transaction Type": "XML PARSE WARNING",
-                        "SEC Transaction Code": "",
-                        "Price Range ($)": None,
-                        "End of Filing Shares": None,
-                        "% Change": None,
-                        "Filed Date": filed_iso,
-                        "Source": doc_url,
-                        "accession": acc,
-                        "AD_Flag": "",
-                        "AcqDisp": "",
-                        "Rule 10b5-1 Plan": False,
-                        "Tax-Related": False,
-                        "_is_derivative": False,
-                        "_issuer_name": "",
-                        "_issuer_ticker": "",
-                        "_owner_role": "",
-                        "_price_present": False,
-                        "Plan Adoption Date": None,
-                    }
-                )
-
-            # Build roll-ups and extend
-            combined = build_events_and_rollups(
-                src_rows, accession=acc, filed_iso=filed_iso
-            )
-            all_rows.extend(combined)
-            added += len(combined)
-
         except Exception:
             parse_errors += 1
             print(tag, "... parse error")
-            time.sleep(SLEEP_SEC)
             continue
 
+        doc_url = form4_doc_url(BLOCK_CIK10, acc, items=index_items)
+        filed_iso = iso_date_from_mdy(f["filed_at"]) or (f["filed_at"] or "")
         src = "cache" if from_cache else "web"
-        print(
-            tag,
-            f"... +{len(src_rows)} SOURCE rows -> {len(combined)} total rows ({src})",
-        )
-        time.sleep(SLEEP_SEC)
+        print(tag, f"... queued for parse ({src})")
+        tasks.append((xml_bytes, acc, filed_iso, doc_url, display))
+
+    fetch_pool.shutdown(wait=False)
+
+    # Stage 2 (CPU, process pool): parse + roll-up scale across cores; on a
+    # warm cache this loop dominates wall time.
+    if len(tasks) > 1:
+        with ProcessPoolExecutor() as parse_pool:
+            results = list(parse_pool.map(_parse_worker, tasks, chunksize=16))
+    else:
+        results = [_parse_worker(t) for t in tasks]
+
+    # Stage 3 (serial): assemble rows and completeness warnings in order.
+    for task, res in zip(tasks, results):
+        _, acc, filed_iso, doc_url, display = task
+        if res is None:
+            parse_errors += 1
+            print(f"[WARN] {acc}: parse error")
+            continue
+
+        combined, emitted_source, xml_txn_count = res
+        if emitted_source != xml_txn_count:
+            print(f"[WARN] {acc}: XML txns={xml_txn_count}, emitted={emitted_source}")
+            all_rows.append(
+                {
+                    "RowTag": "SOURCE",
+                    "EventID": "",
+                    "LinkRole": "other",
+                    "Holder Name": display,
+                    "Trade Date Range": "",
+                    "Security Type": "",
+                    "Transacted Shares": None,
+                    "Transaction Value Range ($)": None,
+                    "Transaction Type": "XML PARSE WARNING",
+                    "SEC Transaction Code": "",
+                    "Price Range ($)": None,
+                    "End of Filing Shares": None,
+                    "% Change": None,
+                    "Filed Date": filed_iso,
+                    "Source": doc_url,
+                    "accession": acc,
+                    "AD_Flag": "",
+                    "AcqDisp": "",
+                    "Rule 10b5-1 Plan": False,
+                    "Tax-Related": False,
+                    "_is_derivative": False,
+                    "_issuer_name": "",
+                    "_issuer_ticker": "",
+                    "_owner_role": "",
+                    "_price_present": False,
+                    "Plan Adoption Date": None,
+                }
+            )
+
+        all_rows.extend(combined)
+        added += len(combined)
+        print(f"{acc} ... +{emitted_source} SOURCE rows -> {len(combined)} total rows")
 
     # Assemble DataFrame
     col_order = [
@@ -773,13 +1081,20 @@ def run(mode: str, outfile: str):
         "_owner_role",
         "Plan Adoption Date",
     ]
-    df = pd.DataFrame(all_rows)
-    for c in col_order:
-        if c not in df.columns:
-            df[c] = None
-
-    # Numeric coercion
-    for c in [
+    # Columnar (struct-of-arrays) assembly: build each column list directly
+    # instead of letting pandas transpose a list of 30+-key dicts; missing
+    # columns come out as all-None with no reindex needed.
+    out_cols = list(col_order)
+    seen_cols = set(out_cols)
+    for r in all_rows:
+        for k in r:
+            if k not in seen_cols:
+                seen_cols.add(k)
+                out_cols.append(k)
+    df = pd.DataFrame({c: [r.get(c) for r in all_rows] for c in out_cols})
+
+    # Numeric coercion: one assignment instead of ten per-column writebacks
+    numeric_cols = [
         "Transacted Shares",
         "Transaction Value Range ($)",
         "Price Range ($)",
@@ -790,20 +1105,34 @@ def run(mode: str, outfile: str):
         "ExerciseShares_Est",
         "SoldNonTax_Sum",
         "MatchDelta",
-    ]:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
+    ]
+    df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors="coerce")
 
     # Sort: newest first by TradeDate_Start / Trade Date Range; ROLLUP above SOURCE
-    df["SortDate"] = df["TradeDate_Start"].fillna(df["Trade Date Range"])
-    df["RowOrder"] = df["RowTag"].map({"ROLLUP": 0, "SOURCE": 1}).fillna(2)
-    link_ord = {
-        "exercise": 0,
-        "sale-common": 1,
-        "tax-sale-issuer": 2,
-        "tax-sale-open": 3,
-        "other": 9,
-    }
-    df["LinkOrder"] = df["LinkRole"].map(link_ord).fillna(9)
+    # Keys are datetime64/int8 so the sort runs on native dtypes, not objects.
+    df["SortDate"] = pd.to_datetime(
+        df["TradeDate_Start"].fillna(df["Trade Date Range"]),
+        format="%Y-%m-%d",
+        errors="coerce",
+    )
+    row_codes = (
+        df["RowTag"]
+        .astype(pd.CategoricalDtype(["ROLLUP", "SOURCE"], ordered=True))
+        .cat.codes
+    )
+    df["RowOrder"] = row_codes.where(row_codes >= 0, 2).astype("int8")
+    # "other"/blank link roles share rank 9, matching the old map+fillna
+    link_codes = (
+        df["LinkRole"]
+        .astype(
+            pd.CategoricalDtype(
+                ["exercise", "sale-common", "tax-sale-issuer", "tax-sale-open"],
+                ordered=True,
+            )
+        )
+        .cat.codes
+    )
+    df["LinkOrder"] = link_codes.where(link_codes >= 0, 9).astype("int8")
     df.sort_values(
         by=["SortDate", "EventID", "RowOrder", "LinkOrder", "accession"],
         ascending=[False, True, True, True, True],
@@ -822,7 +1151,17 @@ if __name__ == "__main__":
     ap = argparse.ArgumentParser(
         description="Amrita Ahuja (Block) — one-tab roll-ups (robust & split)"
     )
-    ap.add_argument("--mode", choices=["full", "update"], required=True)
+    ap.add_argument("--mode", choices=["full", "update"])
     ap.add_argument("--outfile", default="amrita_form4.csv")
+    ap.add_argument(
+        "--check-only",
+        action="store_true",
+        help="only enumerate filings and print the count (no heavy imports)",
+    )
     args = ap.parse_args()
-    run(mode=args.mode, outfile=args.outfile)
+    if args.check_only:
+        check_only()
+    elif args.mode:
+        run(mode=args.mode, outfile=args.outfile)
+    else:
+        ap.error("--mode is required unless --check-only is given")
@@ -5,6 +5,11 @@ classification helpers (plan and tax detection, link roles) live in
 ``src.parse_form4`` during the parsing phase.
 """
 
+# Module-level lookup tables: this classifier runs once per transaction, so
+# avoid rebuilding tuples and walking an if/elif chain on every call.
+_SIMPLE_LABELS = {"M": "Option Exercise", "C": "Conversion", "G": "Gift"}
+_OTHER_CODES = frozenset("DFIEHJKLOUVWXZ")
+
 
 def transaction_type_label_initial(
     code: str, is_planned: bool, tax_open: bool, tax_issuer: bool
@@ -18,23 +23,16 @@ def transaction_type_label_initial(
     - Exercise / Conversion / Gift / Acquisition
     - Other / Unknown
     """
-    c = (code or "").upper()
     if tax_issuer:
         return "Tax - Sale to Issuer"
     if tax_open:
         return "Tax - Open Market"
-    if c == "S" and is_planned:
-        return "10b Planned Sale - Common stock"
+    c = (code or "").upper()
     if c == "S":
-        return "Sale (non tax or 10b)"
+        return "10b Planned Sale - Common stock" if is_planned else "Sale (non tax or 10b)"
     if c in ("P", "A"):
         return "10b Plan Buy" if is_planned else "acquisition"
-    if c == "M":
-        return "Option Exercise"
-    if c == "C":
-        return "Conversion"
-    if c == "G":
-        return "Gift"
-    if c in ("D", "F", "I", "E", "H", "J", "K", "L", "O", "U", "V", "W", "X", "Z"):
-        return "Other"
-    return "Unknown"
+    label = _SIMPLE_LABELS.get(c)
+    if label is not None:
+        return label
+    return "Other" if c in _OTHER_CODES else "Unknown"
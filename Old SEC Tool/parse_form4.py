@@ -10,25 +10,28 @@ Responsibilities:
 
 from __future__ import annotations
 
+import io
+import math
 import re
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
-import pandas as pd
 from lxml import etree
 
 from .classify import transaction_type_label_initial
 
 
 # ---------------- Regex helpers ---------------- #
-RULE_RE = re.compile(r"10b5-?1", re.IGNORECASE)
+# Non-capturing groups + ASCII case folding: these run against every footnote
+# and usually fail, so avoid capture-group bookkeeping and Unicode tables.
+RULE_RE = re.compile(r"10b5-?1", re.IGNORECASE | re.ASCII)
 TAX_RE = re.compile(
-    r"(withhold|withholding|withheld|tax(es)?|sell-?\s?to-?\s?cover|net\s+share\s+settle(ment)?|to\s+satisfy\s+(applicable\s+)?tax)",
-    re.IGNORECASE,
+    r"(?:withh(?:old(?:ing)?|eld)|tax(?:es)?|sell-?\s?to-?\s?cover|net\s+share\s+settle(?:ment)?|to\s+satisfy\s+(?:applicable\s+)?tax)",
+    re.IGNORECASE | re.ASCII,
 )
 ISSUER_RE = re.compile(
-    r"(to\s+the\s+issuer|to\s+issuer|surrendered\s+to\s+(the\s+)?(issuer|company)|withheld\s+by\s+(the\s+)?issuer|tendered\s+to\s+(the\s+)?(issuer|company))",
-    re.IGNORECASE,
+    r"(?:to\s+(?:the\s+)?issuer|surrendered\s+to\s+(?:the\s+)?(?:issuer|company)|withheld\s+by\s+(?:the\s+)?issuer|tendered\s+to\s+(?:the\s+)?(?:issuer|company))",
+    re.IGNORECASE | re.ASCII,
 )
 ISO_D = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
 MDY_S = re.compile(
@@ -37,12 +40,65 @@ MDY_S = re.compile(
 )
 NUM_MDY = re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{4})\b")
 
+# Compiled XPath objects: string .xpath() calls re-parse the expression on
+# every invocation, which adds up across transactions.
+_PLAN_XPATHS = [
+    etree.XPath(xp + "//text()")
+    for xp in (
+        ".//transactionCoding/pursuantToRule10b5-1",
+        ".//transactionCoding/pursuantToRule10b5_1",
+        ".//transactionCoding/rule10b5-1",
+        ".//transactionCoding/rule10b5_1",
+        ".//*[contains(local-name(),'10b5') and contains(local-name(),'1')]",
+    )
+]
+_FOOTNOTE_ID_ATTRS = etree.XPath(".//*[@footnoteId]/@footnoteId")
+
+# Tags collected in a single subtree walk per transaction (see emit)
+_EMIT_TAGS = frozenset(
+    {
+        "transactionCode",
+        "transactionDate",
+        "securityTitle",
+        "transactionShares",
+        "underlyingSecurityShares",
+        "numberOfDerivativeSecuritiesAcquiredOrDisposed",
+        "transactionPricePerShare",
+        "sharesOwnedFollowingTransaction",
+        "transactionAcquiredDisposedCode",
+    }
+)
+
+
+def _fnum(s) -> float:  # noqa: ANN001 - str or None
+    """Scalar float coercion; pd.to_numeric takes the array path even for a
+    single value, which is ~10x slower than a plain float() call."""
+    try:
+        return float(s.replace(",", ""))
+    except (ValueError, AttributeError):
+        return float("nan")
+
+
+def _looks_iso_prefix(s: str) -> bool:
+    """True when s starts with a YYYY-MM-DD shape; avoids the regex machinery
+    for the dominant already-ISO case."""
+    return (
+        len(s) >= 10
+        and s[4] == "-"
+        and s[7] == "-"
+        and s[:4].isdigit()
+        and s[5:7].isdigit()
+        and s[8:10].isdigit()
+    )
+
 
 def iso_date_from_mdy(txt: str) -> Optional[str]:
     """Convert 'MM/DD/YYYY' or 'Month D, YYYY' to 'YYYY-MM-DD'; pass through if already ISO."""
     if not txt:
         return None
     s = txt.strip()
+    if _looks_iso_prefix(s):
+        return s[:10]
     m = ISO_D.search(s)
     if m:
         return s[:10]
@@ -66,6 +122,12 @@ def iso_date_from_mdy(txt: str) -> Optional[str]:
 
 def _parse_date_str(txt: str) -> Optional[str]:
     s = (txt or "").strip()
+    if _looks_iso_prefix(s):
+        y, mo, d = int(s[:4]), int(s[5:7]), int(s[8:10])
+        try:
+            return datetime(y, mo, d).date().isoformat()
+        except Exception:
+            return None
     m = ISO_D.search(s)
     if m:
         y, mo, d = map(int, m.groups())
@@ -94,15 +156,24 @@ def _parse_date_str(txt: str) -> Optional[str]:
 def find_adoption_date_in_text(txt: str) -> Optional[str]:
     if not txt:
         return None
+    # str.find uses CPython's SIMD-backed substring search, far cheaper than
+    # running the anchor regex over the full text of long footnotes.
     hits: List[str] = []
-    for m in re.finditer(
-        r"(adopt(?:ed|ion)?|entered\s+into)", txt, flags=re.IGNORECASE
-    ):
-        start = max(0, m.start() - 50)
-        end = min(len(txt), m.end() + 50)
-        d = _parse_date_str(txt[start:end])
+    low = txt.lower()
+    n = len(txt)
+    i = 0
+    while True:
+        j = low.find("adopt", i)
+        k = low.find("entered into", i)
+        if j < 0 and k < 0:
+            break
+        pos = j if (k < 0 or (0 <= j < k)) else k
+        # Same +/-50-char context window as the old regex scan (62 covers
+        # the longest anchor plus 50).
+        d = _parse_date_str(txt[max(0, pos - 50):min(n, pos + 62)])
         if d:
             hits.append(d)
+        i = pos + 5
     if hits:
         return sorted(hits)[0]
     return _parse_date_str(txt)
@@ -117,28 +188,68 @@ def parse_transactions(xml_text: str, insider_display: str) -> Tuple[List[Dict],
     - Extracts Plan Adoption Date on SOURCE rows under a plan
     - Sets LinkRole for downstream linking
     """
-    root = etree.fromstring(xml_text.encode("utf-8"))
-
-    issuer_name = (root.findtext(".//issuerName") or "").strip()
-    issuer_ticker = (root.findtext(".//issuerTradingSymbol") or "").strip()
-    role = (root.findtext(".//reportingOwner//officerTitle") or "").strip()
-
-    # footnotes index
+    # One streaming pass collects issuer info, footnotes and transaction
+    # nodes, replacing the separate full-tree findall/findtext scans. The
+    # tree itself is kept alive (no element.clear()): footnotes come after
+    # the tables in ownershipDocument, and the adoption-date scan needs the
+    # ancestor axis.
+    context = etree.iterparse(
+        io.BytesIO(xml_text.encode("utf-8")),
+        events=("end",),
+        tag=(
+            "issuerName",
+            "issuerTradingSymbol",
+            "officerTitle",
+            "footnote",
+            "nonDerivativeTransaction",
+            "derivativeTransaction",
+        ),
+    )
+    issuer_name = issuer_ticker = role = ""
     footnotes: Dict[str, str] = {}
-    for fn in root.findall(".//footnotes/footnote"):
-        fid = fn.get("id")
-        if fid:
-            footnotes[fid] = "".join(fn.itertext()).strip()
-
-    def val(tx, xpath: str) -> str:  # noqa: ANN001 - lxml element
-        return (tx.findtext(xpath + "/value") or tx.findtext(xpath) or "").strip()
+    nd_nodes: List = []
+    d_nodes: List = []
+    for _, el in context:
+        t = el.tag
+        if t == "nonDerivativeTransaction":
+            nd_nodes.append(el)
+        elif t == "derivativeTransaction":
+            d_nodes.append(el)
+        elif t == "footnote":
+            fid = el.get("id")
+            if fid:
+                # Single C-level walk; itertext() would allocate a Python
+                # string per descendant of footnotes with nested markup.
+                footnotes[fid] = etree.tostring(
+                    el, method="text", encoding="unicode"
+                ).strip()
+        elif t == "issuerName":
+            if not issuer_name:
+                issuer_name = (el.text or "").strip()
+        elif t == "issuerTradingSymbol":
+            if not issuer_ticker:
+                issuer_ticker = (el.text or "").strip()
+        elif t == "officerTitle":
+            if not role:
+                role = (el.text or "").strip()
+
+    # The same footnote is referenced by many transactions; run each regex
+    # once per footnote here instead of once per referencing transaction.
+    fn_flags: Dict[str, Tuple[bool, bool, bool]] = {
+        fid: (
+            bool(TAX_RE.search(t)),
+            bool(ISSUER_RE.search(t)),
+            bool(RULE_RE.search(t)),
+        )
+        for fid, t in footnotes.items()
+    }
 
     def ref_ids(tx) -> List[str]:  # noqa: ANN001
         ids: List[str] = []
         for n in tx.findall(".//footnoteId"):
             if n.get("id"):
                 ids.append(n.get("id"))
-        ids += tx.xpath(".//*[@footnoteId]/@footnoteId")
+        ids += _FOOTNOTE_ID_ATTRS(tx)
         # unique, preserve order
         seen, out = set(), []
         for i in ids:
@@ -147,100 +258,115 @@ def parse_transactions(xml_text: str, insider_display: str) -> Tuple[List[Dict],
                 out.append(i)
         return out
 
-    def has_plan(tx) -> bool:  # noqa: ANN001
-        if any(RULE_RE.search(footnotes.get(fid, "")) for fid in ref_ids(tx)):
+    def has_plan(tx, rids: List[str]) -> bool:  # noqa: ANN001
+        if any(fid in fn_flags and fn_flags[fid][2] for fid in rids):
             return True
-        for xp in [
-            ".//transactionCoding/pursuantToRule10b5-1",
-            ".//transactionCoding/pursuantToRule10b5_1",
-            ".//transactionCoding/rule10b5-1",
-            ".//transactionCoding/rule10b5_1",
-            ".//*[contains(local-name(),'10b5') and contains(local-name(),'1')]",
-        ]:
-            vals = [t.strip().lower() for t in tx.xpath(f"{xp}//text()")]
+        for xp in _PLAN_XPATHS:
+            vals = [t.strip().lower() for t in xp(tx)]
             if any(v in ("1", "true", "y", "yes", "x") for v in vals):
                 return True
         return False
 
     def tax_flags(
-        tx, code: str, price_present: bool
+        tx, code: str, price_present: bool, rids: List[str]
     ) -> Tuple[bool, bool]:  # noqa: ANN001
         c = (code or "").upper()
         if c in ("F", "D"):
             return (False, True)
-        texts = [footnotes.get(fid, "") for fid in ref_ids(tx)]
-        any_tax = any(TAX_RE.search(t) for t in texts)
-        issuerish = any(ISSUER_RE.search(t) for t in texts)
+        flags = [fn_flags[fid] for fid in rids if fid in fn_flags]
+        any_tax = any(f[0] for f in flags)
+        issuerish = any(f[1] for f in flags)
         if c == "S" and any_tax and price_present and not issuerish:
             return (True, False)  # open-market sell-to-cover
         if any_tax and issuerish:
             return (False, True)  # surrender/withhold to issuer
         return (False, False)
 
-    def adoption_date_from_tx(tx) -> Optional[str]:  # noqa: ANN001
-        # 1) tags containing 'adopt' near the tx
-        for node in tx.xpath(". | ancestor::*"):
-            for cn in node.xpath(
-                ".//*[contains(translate(local-name(),'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'adopt')]"
-            ):
+    def adoption_date_from_tx(tx, rids: List[str]) -> Optional[str]:  # noqa: ANN001
+        # 1) tags containing 'adopt' near the tx — scan the enclosing table
+        # only; the old ancestor::* walk re-scanned most of the document for
+        # every plan transaction.
+        scope = tx.getparent()
+        for cn in (scope if scope is not None else tx).iter():
+            tag = cn.tag
+            if isinstance(tag, str) and "adopt" in tag.lower():
                 d = find_adoption_date_in_text(" ".join(cn.itertext()))
                 if d:
                     return d
         # 2) referenced footnotes
-        for fid in ref_ids(tx):
+        for fid in rids:
             d = find_adoption_date_in_text(footnotes.get(fid, ""))
             if d:
                 return d
         return None
 
     rows: List[Dict] = []
-    nd_nodes = root.findall(".//nonDerivativeTable/nonDerivativeTransaction")
-    d_nodes = root.findall(".//derivativeTable/derivativeTransaction")
     xml_txn_count = len(nd_nodes) + len(d_nodes)
 
-    def robust_shares(tx) -> Optional[float]:  # noqa: ANN001
-        s = pd.to_numeric(val(tx, ".//transactionShares"), errors="coerce")
-        if (s is None) or (pd.isna(s)) or (s == 0):
-            s = pd.to_numeric(val(tx, ".//underlyingSecurityShares"), errors="coerce")
-        if (s is None) or (pd.isna(s)) or (s == 0):
-            s = pd.to_numeric(
-                val(tx, ".//numberOfDerivativeSecuritiesAcquiredOrDisposed"),
-                errors="coerce",
+    # Fields constant across every row of this filing. Each emitted row
+    # starts as a C-level copy of this template, so the shared keys are
+    # hashed once here instead of once per transaction.
+    row_base = {
+        "Holder Name": insider_display,
+        "% Change": None,
+        "Filed Date": None,  # set later
+        "Source": "",
+        "accession": "",
+        "RowTag": "SOURCE",
+        "EventID": "",
+        "_issuer_name": issuer_name,
+        "_issuer_ticker": issuer_ticker,
+        "_owner_role": role,
+    }
+
+    def robust_shares(fields: Dict[str, str]) -> float:
+        s = _fnum(fields.get("transactionShares", ""))
+        if math.isnan(s) or s == 0:
+            s = _fnum(fields.get("underlyingSecurityShares", ""))
+        if math.isnan(s) or s == 0:
+            s = _fnum(
+                fields.get("numberOfDerivativeSecuritiesAcquiredOrDisposed", "")
             )
         return s
 
     def emit(tx, is_deriv: bool):  # noqa: ANN001
-        code = (tx.findtext(".//transactionCoding/transactionCode") or "").strip()
-        raw_dt = val(tx, ".//transactionDate")
+        # One walk over the subtree collects every field of interest; the
+        # first occurrence in document order wins, matching .// lookups.
+        fields: Dict[str, str] = {}
+        for el in tx.iter():
+            t = el.tag
+            if t in _EMIT_TAGS and t not in fields:
+                fields[t] = (el.findtext("value") or el.text or "").strip()
+        rids = ref_ids(tx)
+
+        code = fields.get("transactionCode", "")
+        raw_dt = fields.get("transactionDate", "")
         iso_dt = iso_date_from_mdy(raw_dt) or raw_dt or ""
-        title = val(tx, ".//securityTitle")
-        shares = robust_shares(tx)
-        price = pd.to_numeric(val(tx, ".//transactionPricePerShare"), errors="coerce")
-        post = pd.to_numeric(
-            (tx.findtext(".//sharesOwnedFollowingTransaction/value") or "").strip(),
-            errors="coerce",
-        )
-        acqdsp = (tx.findtext(".//transactionAcquiredDisposedCode/value") or "").strip()
+        title = fields.get("securityTitle", "")
+        shares = robust_shares(fields)
+        price = _fnum(fields.get("transactionPricePerShare", ""))
+        post = _fnum(fields.get("sharesOwnedFollowingTransaction", ""))
+        acqdsp = fields.get("transactionAcquiredDisposedCode", "")
+        price_present = not math.isnan(price)
+
+        # Upper-cased codes computed once; reused below for LinkRole too
+        au = acqdsp.upper()
+        cu = code.upper()
 
         signed = shares
-        if pd.notna(shares):
-            if acqdsp.upper() == "D":
+        if not math.isnan(shares):
+            if au == "D":
                 signed = -abs(shares)
-            elif acqdsp.upper() == "A":
+            elif au == "A":
                 signed = abs(shares)
             else:
-                signed = (
-                    -abs(shares)
-                    if (code or "").upper() in ("S", "F", "G")
-                    else abs(shares)
-                )
-
-        plan = has_plan(tx)
-        tax_open, tax_issuer = tax_flags(tx, code, pd.notna(price))
+                signed = -abs(shares) if cu in ("S", "F", "G") else abs(shares)
+
+        plan = has_plan(tx, rids)
+        tax_open, tax_issuer = tax_flags(tx, code, price_present, rids)
         label = transaction_type_label_initial(code, plan, tax_open, tax_issuer)
 
         # LinkRole
-        cu = (code or "").upper()
         if cu in ("M", "C", "X", "O"):
             link_role = "exercise"
         elif cu == "S":
@@ -255,42 +381,34 @@ def parse_transactions(xml_text: str, insider_display: str) -> Tuple[List[Dict],
         else:
             link_role = "other"
 
-        plan_adopt = adoption_date_from_tx(tx) if plan else None
+        plan_adopt = adoption_date_from_tx(tx, rids) if plan else None
 
-        rows.append(
+        row = dict(row_base)
+        row.update(
             {
-                "Holder Name": insider_display,
                 "Trade Date Range": iso_dt,
                 "Security Type": title,
                 "Transacted Shares": signed if signed is not None else shares,
                 "Transaction Value Range ($)": (
                     float(round(abs(shares) * price, 2))
-                    if pd.notna(shares) and pd.notna(price)
+                    if not math.isnan(shares) and price_present
                     else None
                 ),
                 "Transaction Type": label,
                 "SEC Transaction Code": code,
                 "Price Range ($)": price,
                 "End of Filing Shares": post,
-                "% Change": None,
-                "Filed Date": None,  # set later
-                "Source": "",
-                "accession": "",
-                "RowTag": "SOURCE",
-                "EventID": "",
                 "LinkRole": link_role,
                 "AD_Flag": acqdsp,
                 "AcqDisp": acqdsp,
                 "Rule 10b5-1 Plan": bool(plan),
                 "Tax-Related": bool(tax_open or tax_issuer),
                 "_is_derivative": is_deriv,
-                "_issuer_name": issuer_name,
-                "_issuer_ticker": issuer_ticker,
-                "_owner_role": role,
-                "_price_present": pd.notna(price),
+                "_price_present": price_present,
                 "Plan Adoption Date": plan_adopt,
             }
         )
+        rows.append(row)
 
     for tx in nd_nodes:
         emit(tx, is_deriv=False)
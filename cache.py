@@ -0,0 +1,50 @@
+"""File-backed response cache with TTL for DB API probes.
+
+Diagnostic scripts hit the same fixed CIK and accession on every rerun;
+caching the JSON payloads on disk turns repeat runs into local reads.
+Entries expire after the TTL so stale API data is eventually refetched.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+
+class FileCache:
+    """Gzipped JSON blobs under root/<subdir>/<md5(key)>.json.gz."""
+
+    def __init__(self, root: str = '.cache', ttl: float = 24 * 3600):
+        self.root = Path(root)
+        self.ttl = ttl
+
+    def _path(self, key: str, subdir: str = '') -> Path:
+        digest = hashlib.md5(key.encode('utf-8')).hexdigest()
+        base = self.root / subdir if subdir else self.root
+        return base / f'{digest}.json.gz'
+
+    def get(self, key: str, subdir: str = '') -> Optional[Any]:
+        """Return the cached payload, or None if absent, stale, or corrupt."""
+        path = self._path(key, subdir)
+        try:
+            blob = json.loads(gzip.decompress(path.read_bytes()))
+        except (OSError, ValueError):
+            return None
+        if time.time() - blob.get('ts', 0) > self.ttl:
+            return None
+        return blob.get('payload')
+
+    def set(self, key: str, payload: Any, subdir: str = '') -> None:
+        """Best-effort atomic write (tmp file + rename)."""
+        path = self._path(key, subdir)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            blob = json.dumps({'ts': time.time(), 'payload': payload})
+            tmp = path.with_suffix(f'.tmp{os.getpid()}')
+            tmp.write_bytes(gzip.compress(blob.encode('utf-8')))
+            os.replace(tmp, path)
+        except (OSError, TypeError):
+            pass
@@ -4,13 +4,21 @@ import argparse
 import re
 from datetime import datetime
 from typing import Dict, List, Tuple
-from collections import defaultdict
+from collections import Counter, defaultdict
 
 import pandas as pd
 
+# Non-ISO formats probed by parse_capiq_date, hoisted so the tuple is not
+# rebuilt per cell; ISO inputs never reach this loop.
+_CAPIQ_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y')
+
 
 def parse_capiq_shares(value) -> float:
-    """Parse CAPIQ share value, handling parentheses for negatives."""
+    """Parse one CAPIQ share value, handling parentheses for negatives.
+
+    Scalar fallback only — bulk loading goes through the vectorized string
+    pipeline in load_capiq_data.
+    """
     if pd.isna(value):
         return 0.0
     s = str(value).replace(',', '').strip()
@@ -25,9 +33,17 @@ def parse_capiq_date(value) -> str:
         return ''
     if isinstance(value, datetime):
         return value.strftime('%Y-%m-%d')
-    # Try parsing string formats
     s = str(value).strip()
-    for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y']:
+    # Fast path: already-canonical YYYY-MM-DD prefix, as in load_our_data
+    if len(s) >= 10 and s[4] == '-' and s[7] == '-' and s[:4].isdigit():
+        return s[:10]
+    # fromisoformat handles ISO timestamps in C, far faster than strptime
+    try:
+        return datetime.fromisoformat(s.replace('Z', '+00:00')).strftime('%Y-%m-%d')
+    except ValueError:
+        pass
+    # Fall back to the slower format probe for non-ISO strings
+    for fmt in _CAPIQ_FORMATS:
         try:
             return datetime.strptime(s, fmt).strftime('%Y-%m-%d')
         except ValueError:
@@ -38,12 +54,12 @@ def parse_capiq_date(value) -> str:
 def load_capiq_data(filepath: str) -> pd.DataFrame:
     """Load CAPIQ xlsx file with correct header row."""
     # CAPIQ files have metadata in first ~54 rows
-    df = pd.read_excel(filepath, header=None)
+    raw = pd.read_excel(filepath, header=None)
 
     # Find header row by looking for 'Holder Name'
     header_row = None
-    for i in range(min(100, len(df))):
-        row = df.iloc[i].tolist()
+    for i in range(min(100, len(raw))):
+        row = raw.iloc[i].tolist()
         if 'Holder Name' in str(row):
             header_row = i
             break
@@ -51,13 +67,29 @@ def load_capiq_data(filepath: str) -> pd.DataFrame:
     if header_row is None:
         raise ValueError("Could not find 'Holder Name' header in CAPIQ file")
 
-    # Re-read with correct header
-    df = pd.read_excel(filepath, header=header_row)
-
-    # Parse dates and shares
-    df['trade_date'] = df['Trade Date Range'].apply(parse_capiq_date)
-    df['filed_date'] = df['Filed Date'].apply(parse_capiq_date)
-    df['shares'] = df['Transacted Shares'].apply(parse_capiq_shares)
+    # Slice the parse we already have instead of re-reading the whole xlsx
+    df = raw.iloc[header_row + 1:].copy()
+    df.columns = raw.iloc[header_row].tolist()
+    df = df.reset_index(drop=True)
+
+    # Parse dates and shares with vectorized pandas ops instead of per-cell
+    # Python .apply — the load step is dominated by interpreter dispatch.
+    def _date_col(s: pd.Series) -> pd.Series:
+        parsed = pd.to_datetime(s, errors='coerce')
+        out = parsed.dt.strftime('%Y-%m-%d')
+        # Unparseable strings pass through; blank cells become '' like
+        # parse_capiq_date did.
+        fallback = s.astype(str).str.strip().where(s.notna(), '')
+        return out.fillna(fallback)
+
+    df['trade_date'] = _date_col(df['Trade Date Range'])
+    df['filed_date'] = _date_col(df['Filed Date'])
+
+    # Shares: strip commas, map '(123)' accounting negatives, coerce in one go
+    s = df['Transacted Shares'].astype(str).str.replace(',', '', regex=False).str.strip()
+    neg = s.str.startswith('(') & s.str.endswith(')')
+    s = s.where(~neg, '-' + s.str.slice(1, -1))
+    df['shares'] = pd.to_numeric(s, errors='coerce').fillna(0.0)
 
     return df
 
@@ -83,15 +115,37 @@ def load_our_data(filepath: str) -> pd.DataFrame:
 
 def group_by_filing(df: pd.DataFrame) -> Dict[Tuple[str, str], List[float]]:
     """Group share amounts by (trade_date, filed_date)."""
+    # Iterate plain arrays; iterrows builds a Series per row, which dominates
+    # the cost of this loop.
     groups = defaultdict(list)
-    for _, row in df.iterrows():
-        key = (row['trade_date'], row['filed_date'])
-        shares = row['shares']
+    trade_dates = df['trade_date'].to_numpy()
+    filed_dates = df['filed_date'].to_numpy()
+    shares_arr = df['shares'].to_numpy()
+    for trade_date, filed_date, shares in zip(trade_dates, filed_dates, shares_arr):
         if shares != 0:
-            groups[key].append(shares)
+            groups[(trade_date, filed_date)].append(float(shares))
     return groups
 
 
+def achievable_rollup_sums(values: List[float], max_terms: int = 4) -> set:
+    """All sums of 2..max_terms distinct entries of values, in integer cents.
+
+    Cents scaling makes membership tests exact (matching the old 0.01 float
+    tolerance) and bounds the table, so this runs in O(n * distinct sums)
+    instead of enumerating every combination.
+    """
+    # sums_by_k[k] holds sums using exactly k entries; iterating k downward
+    # per value keeps each entry used at most once (0/1 knapsack order).
+    sums_by_k: List[set] = [set() for _ in range(max_terms + 1)]
+    for v in values:
+        cents = round(v * 100)
+        for k in range(max_terms - 1, 0, -1):
+            if sums_by_k[k]:
+                sums_by_k[k + 1].update(s + cents for s in sums_by_k[k])
+        sums_by_k[1].add(cents)
+    return set().union(*sums_by_k[2:])
+
+
 def is_likely_rollup(value: float, all_values: List[float]) -> bool:
     """Check if a value is likely a rollup (sum of other values)."""
     # Check if this value equals the sum of some other values
@@ -100,12 +154,7 @@ def is_likely_rollup(value: float, all_values: List[float]) -> bool:
         return False
 
     # Check common rollup patterns: sum of 2-4 values
-    from itertools import combinations
-    for r in range(2, min(5, len(other_values) + 1)):
-        for combo in combinations(other_values, r):
-            if abs(sum(combo) - value) < 0.01:  # Float tolerance
-                return True
-    return False
+    return round(value * 100) in achievable_rollup_sums(other_values)
 
 
 def compare_share_lists(capiq_shares: List[float], our_shares: List[float]) -> Tuple[bool, List[float], List[float], List[float]]:
@@ -114,26 +163,32 @@ def compare_share_lists(capiq_shares: List[float], our_shares: List[float]) -> T
     Returns:
         (is_match, missing_in_ours, extra_in_ours, likely_capiq_rollups)
     """
-    capiq_sorted = sorted(capiq_shares)
-    our_sorted = sorted(our_shares)
+    # Multiset comparison via Counter arithmetic: O(n) hashing instead of
+    # sorting plus a linear list.remove per shared value.
+    capiq_counts = Counter(capiq_shares)
+    our_counts = Counter(our_shares)
 
-    if capiq_sorted == our_sorted:
+    # Length gate short-circuits the dict comparison for most mismatches
+    if len(capiq_shares) == len(our_shares) and capiq_counts == our_counts:
         return True, [], [], []
 
-    # Find differences
-    capiq_remaining = capiq_sorted.copy()
-    our_remaining = our_sorted.copy()
-
-    for share in capiq_sorted:
-        if share in our_remaining:
-            our_remaining.remove(share)
-            capiq_remaining.remove(share)
+    # Find differences (sorted to keep report output deterministic)
+    capiq_remaining = sorted((capiq_counts - our_counts).elements())
+    our_remaining = sorted((our_counts - capiq_counts).elements())
 
-    # Check if missing values are likely CAPIQ rollups
+    # Check if missing values are likely CAPIQ rollups. The candidate-sum
+    # table depends only on capiq_shares, so build it once per group instead
+    # of once per missing value.
     likely_rollups = []
-    for missing in capiq_remaining:
-        if is_likely_rollup(missing, capiq_shares):
-            likely_rollups.append(missing)
+    # No 2-4 term sum can reach past the total magnitude available, so skip
+    # building the sum table for genuine data mismatches beyond that bound.
+    if capiq_remaining and abs(sum(capiq_remaining)) <= sum(
+        abs(v) for v in capiq_shares
+    ):
+        achievable = achievable_rollup_sums(capiq_shares)
+        likely_rollups = [
+            m for m in capiq_remaining if round(m * 100) in achievable
+        ]
 
     return False, capiq_remaining, our_remaining, likely_rollups
 
@@ -169,14 +224,16 @@ def categorize_mismatch(m: Dict) -> str:
         return 'other'
 
 
-def generate_report(
+def iter_report_lines(
     capiq_groups: Dict[Tuple[str, str], List[float]],
     our_groups: Dict[Tuple[str, str], List[float]],
     insider_name: str
-) -> str:
-    """Generate comparison report with categorized mismatches."""
-    lines = []
+):
+    """Yield comparison report lines with categorized mismatches.
 
+    Yielding lines lets callers stream straight to a file without
+    materializing the whole report string first.
+    """
     # Get all filing keys
     all_keys = set(capiq_groups.keys()) | set(our_groups.keys())
 
@@ -272,43 +329,43 @@ def generate_report(
     review_count = len(buckets['partial_rollup']) + len(buckets['extra_in_ours']) + len(buckets['other'])
 
     # Header
-    lines.append("=" * 80)
-    lines.append(f"CAPIQ COMPARISON REPORT - {insider_name}")
-    lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    lines.append("=" * 80)
-    lines.append("")
+    yield ("=" * 80)
+    yield (f"CAPIQ COMPARISON REPORT - {insider_name}")
+    yield (f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    yield ("=" * 80)
+    yield ("")
 
     # High-level summary
     total = matches + len(mismatches) + len(missing_in_ours_filings) + len(missing_in_capiq_filings)
-    lines.append("SUMMARY")
-    lines.append("-" * 40)
-    lines.append(f"  Total filings compared:    {total}")
-    lines.append(f"  Perfect matches:           {matches}")
-    lines.append(f"  Mismatches:                {len(mismatches)}")
-    lines.append(f"  Missing in our data:       {len(missing_in_ours_filings)}")
-    lines.append(f"  Missing in CAPIQ:          {len(missing_in_capiq_filings)}")
-    lines.append("")
+    yield ("SUMMARY")
+    yield ("-" * 40)
+    yield (f"  Total filings compared:    {total}")
+    yield (f"  Perfect matches:           {matches}")
+    yield (f"  Mismatches:                {len(mismatches)}")
+    yield (f"  Missing in our data:       {len(missing_in_ours_filings)}")
+    yield (f"  Missing in CAPIQ:          {len(missing_in_capiq_filings)}")
+    yield ("")
 
     # Mismatch breakdown
-    lines.append("MISMATCH BREAKDOWN")
-    lines.append("-" * 40)
-    lines.append(f"  Non-Issues (presentation differences):")
-    lines.append(f"    - Duplicate values:      {len(buckets['duplicate_pattern'])}")
-    lines.append(f"    - CAPIQ rollups:         {len(buckets['capiq_rollup'])}")
-    lines.append(f"    Subtotal:                {non_issue_count}")
-    lines.append("")
-    lines.append(f"  To Investigate:")
-    lines.append(f"    - Data differences:      {len(buckets['data_difference'])}")
-    lines.append(f"    - Missing in ours:       {len(buckets['missing_in_ours'])}")
-    lines.append(f"    Subtotal:                {investigate_count}")
-    lines.append("")
-    lines.append(f"  To Review:")
-    lines.append(f"    - Partial rollups:       {len(buckets['partial_rollup'])}")
-    lines.append(f"    - Extra in ours:         {len(buckets['extra_in_ours'])}")
-    lines.append(f"    - Other:                 {len(buckets['other'])}")
-    lines.append(f"    Subtotal:                {review_count}")
-    lines.append("")
-    lines.append("=" * 80)
+    yield ("MISMATCH BREAKDOWN")
+    yield ("-" * 40)
+    yield (f"  Non-Issues (presentation differences):")
+    yield (f"    - Duplicate values:      {len(buckets['duplicate_pattern'])}")
+    yield (f"    - CAPIQ rollups:         {len(buckets['capiq_rollup'])}")
+    yield (f"    Subtotal:                {non_issue_count}")
+    yield ("")
+    yield (f"  To Investigate:")
+    yield (f"    - Data differences:      {len(buckets['data_difference'])}")
+    yield (f"    - Missing in ours:       {len(buckets['missing_in_ours'])}")
+    yield (f"    Subtotal:                {investigate_count}")
+    yield ("")
+    yield (f"  To Review:")
+    yield (f"    - Partial rollups:       {len(buckets['partial_rollup'])}")
+    yield (f"    - Extra in ours:         {len(buckets['extra_in_ours'])}")
+    yield (f"    - Other:                 {len(buckets['other'])}")
+    yield (f"    Subtotal:                {review_count}")
+    yield ("")
+    yield ("=" * 80)
 
     # Helper to format a single mismatch
     def format_mismatch(m: Dict) -> List[str]:
@@ -332,39 +389,54 @@ def generate_report(
             continue
 
         info = bucket_info[bucket_key]
-        lines.append("")
-        lines.append(f"{info['icon']} {info['title']} ({len(bucket_mismatches)})")
-        lines.append(f"   {info['desc']}")
-        lines.append("-" * 60)
+        yield ("")
+        yield (f"{info['icon']} {info['title']} ({len(bucket_mismatches)})")
+        yield (f"   {info['desc']}")
+        yield ("-" * 60)
 
         for m in bucket_mismatches:
-            lines.extend(format_mismatch(m))
-            lines.append("")
+            yield from format_mismatch(m)
+            yield ("")
 
     # Missing filings sections
     if missing_in_ours_filings:
-        lines.append("")
-        lines.append(f"[!] FILINGS MISSING IN OUR DATA ({len(missing_in_ours_filings)})")
-        lines.append("   Filings that exist in CAPIQ but not in our output.")
-        lines.append("-" * 60)
+        yield ("")
+        yield (f"[!] FILINGS MISSING IN OUR DATA ({len(missing_in_ours_filings)})")
+        yield ("   Filings that exist in CAPIQ but not in our output.")
+        yield ("-" * 60)
         for key in missing_in_ours_filings:
-            lines.append(f"  Trade: {key[0]}, Filed: {key[1]}")
+            yield (f"  Trade: {key[0]}, Filed: {key[1]}")
 
     if missing_in_capiq_filings:
-        lines.append("")
-        lines.append(f"[~] FILINGS MISSING IN CAPIQ ({len(missing_in_capiq_filings)})")
-        lines.append("   Filings we have that CAPIQ doesn't show.")
-        lines.append("-" * 60)
+        yield ("")
+        yield (f"[~] FILINGS MISSING IN CAPIQ ({len(missing_in_capiq_filings)})")
+        yield ("   Filings we have that CAPIQ doesn't show.")
+        yield ("-" * 60)
         for key in missing_in_capiq_filings:
-            lines.append(f"  Trade: {key[0]}, Filed: {key[1]}")
+            yield (f"  Trade: {key[0]}, Filed: {key[1]}")
 
     # Final summary
-    lines.append("")
-    lines.append("=" * 80)
-    lines.append(f"RESULT: {matches} perfect matches, {investigate_count} to investigate, {non_issue_count} non-issues")
-    lines.append("=" * 80)
+    yield ("")
+    yield ("=" * 80)
+    yield (f"RESULT: {matches} perfect matches, {investigate_count} to investigate, {non_issue_count} non-issues")
+    yield ("=" * 80)
+
+
+def generate_report(
+    capiq_groups: Dict[Tuple[str, str], List[float]],
+    our_groups: Dict[Tuple[str, str], List[float]],
+    insider_name: str
+) -> str:
+    """Materialized report for callers that need the full string."""
+    return "\n".join(iter_report_lines(capiq_groups, our_groups, insider_name))
 
-    return "\n".join(lines)
+
+def _write_report_lines(f, lines) -> None:
+    """Stream lines to an open file, byte-identical to '\\n'.join(lines)."""
+    for i, line in enumerate(lines):
+        if i:
+            f.write('\n')
+        f.write(line)
 
 
 def main():
@@ -392,14 +464,17 @@ def main():
     print(f"  Ours: {len(our_groups)} filings")
 
     print("Generating report...")
-    report = generate_report(capiq_groups, our_groups, args.name)
 
     if args.output:
+        # Stream straight to the file; no full report string in memory
         with open(args.output, 'w', encoding='utf-8') as f:
-            f.write(report)
+            _write_report_lines(
+                f, iter_report_lines(capiq_groups, our_groups, args.name)
+            )
         print(f"Report saved to {args.output}")
     else:
-        # Write to temp file and print safe version
+        # Console path prints the report too, so materialize it once
+        report = generate_report(capiq_groups, our_groups, args.name)
         with open('comparison_report.txt', 'w', encoding='utf-8') as f:
             f.write(report)
         # Print ASCII-safe version
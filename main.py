@@ -7,7 +7,10 @@ Usage:
 """
 
 import argparse
+import itertools
+import logging
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import Optional
 
@@ -17,6 +20,19 @@ from src.rollup_builder import build_rollups
 from src.exporter import to_csv
 
 
+# The same few issuer CIK strings recur across an insider's filings, so
+# normalize each distinct string to int only once.
+_cik_cache = {}
+
+
+def _cik_to_int(s: Optional[str]) -> int:
+    """Normalize a zero-padded CIK string to int, memoized."""
+    v = _cik_cache.get(s)
+    if v is None:
+        v = _cik_cache.setdefault(s, int(s or '0'))
+    return v
+
+
 def generate_filename(transactions: list) -> str:
     """Generate output filename from transaction data.
 
@@ -38,7 +54,9 @@ def process_insider(
     output_file: Optional[str] = None,
     max_filings: Optional[int] = None,
     skip_rollups: bool = False,
-    verbose: bool = True
+    verbose: bool = True,
+    use_cache: bool = True,
+    workers: Optional[int] = None
 ) -> int:
     """Process all Form 4 filings for an insider at a specific company.
 
@@ -49,6 +67,8 @@ def process_insider(
         max_filings: Maximum filings to process (None = all)
         skip_rollups: If True, skip roll-up aggregation
         verbose: Print progress
+        use_cache: Use the on-disk filing cache
+        workers: Parse worker processes (None = cpu count)
 
     Returns:
         Number of transactions processed
@@ -57,28 +77,42 @@ def process_insider(
     filings = get_all_filings_data(
         rpt_owner_cik=cik,
         max_filings=max_filings,
-        verbose=verbose
+        verbose=verbose,
+        use_cache=use_cache
     )
 
     if not filings:
         print(f"No filings found for CIK {cik}")
         return 0
 
-    # Step 2: Parse each filing
+    # Step 2: Parse each filing, filtering by issuer as we go. Every row in
+    # a Form 4 shares one issuer, so checking the first row is enough, and
+    # other issuers' rows never enter the working set.
+    # CIKs in SEC data have leading zeros (e.g., '0001512673'), normalize by converting to int
     all_transactions = []
-    for filing in filings:
-        transactions = parse_filing(filing)
-        all_transactions.extend(transactions)
+    parsed_count = 0
+    # Parsing is CPU-bound, so large runs fan out across processes; small
+    # runs skip the pool-spawn overhead. ex.map preserves filing order.
+    executor = None
+    if len(filings) > 8:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        parsed_iter = executor.map(parse_filing, filings, chunksize=4)
+    else:
+        parsed_iter = map(parse_filing, filings)
+    try:
+        for transactions in parsed_iter:
+            parsed_count += len(transactions)
+            if not transactions:
+                continue
+            if _cik_to_int(transactions[0].get('issuerCik')) != issuer_cik:
+                continue
+            all_transactions.extend(transactions)
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
     if verbose:
-        print(f"Parsed {len(all_transactions)} transactions from {len(filings)} filings")
-
-    # Step 3: Filter by issuer CIK (company)
-    # CIKs in SEC data have leading zeros (e.g., '0001512673'), normalize by converting to int
-    all_transactions = [
-        t for t in all_transactions
-        if int(t.get('issuerCik', '0') or '0') == issuer_cik
-    ]
+        print(f"Parsed {parsed_count} transactions from {len(filings)} filings")
 
     if not all_transactions:
         print(f"No transactions found for issuer CIK {issuer_cik}")
@@ -93,17 +127,15 @@ def process_insider(
         if verbose:
             print("Building roll-ups...")
 
-        # Group transactions by filing for roll-up processing
-        filings_transactions = {}
-        for txn in all_transactions:
-            acc = txn.get('accessionNumber', '')
-            filings_transactions.setdefault(acc, []).append(txn)
+        # Group by filing with one stable sort + groupby instead of a dict
+        # of per-accession lists; rows keep parse order within each filing,
+        # and the export re-sorts globally anyway.
+        acc_key = lambda t: t.get('accessionNumber', '')  # noqa: E731
+        all_transactions.sort(key=acc_key)
 
-        # Process roll-ups per filing
         processed_transactions = []
-        for acc, txns in filings_transactions.items():
-            rolled = build_rollups(txns)
-            processed_transactions.extend(rolled)
+        for _, group in itertools.groupby(all_transactions, key=acc_key):
+            processed_transactions.extend(build_rollups(list(group)))
 
         all_transactions = processed_transactions
 
@@ -157,9 +189,27 @@ def main():
         action='store_true',
         help='Suppress progress output'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bypass the on-disk filing cache'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Parse worker processes (default: CPU count)'
+    )
 
     args = parser.parse_args()
 
+    # Client-layer progress goes through logging; --quiet gates it at the
+    # level check so suppressed messages never even format.
+    logging.basicConfig(
+        level=logging.WARNING if args.quiet else logging.INFO,
+        format='%(message)s'
+    )
+
     try:
         count = process_insider(
             cik=args.cik,
@@ -167,7 +217,9 @@ def main():
             output_file=args.output,
             max_filings=args.max_filings,
             skip_rollups=args.skip_rollups,
-            verbose=not args.quiet
+            verbose=not args.quiet,
+            use_cache=not args.no_cache,
+            workers=args.workers
         )
         print(f"\nDone! Processed {count} transaction rows.")
         return 0
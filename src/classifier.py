@@ -13,29 +13,9 @@ Label priority:
 """
 
 
-def classify(
-    transaction_code: str,
-    is_10b5_1: bool,
-    tax_type: str = None
-) -> str:
-    """Classify a transaction and return human-readable label.
-
-    Args:
-        transaction_code: SEC transaction code (M, S, F, P, A, G, C, etc.)
-        is_10b5_1: Whether transaction is under a 10b5-1 plan
-        tax_type: "issuer", "open-market", or None
-
-    Returns:
-        Human-readable label string
-    """
-    code = (transaction_code or "").upper()
-
-    # Tax takes highest priority
-    if tax_type == "issuer":
-        return "Tax - Sale to Issuer"
-    if tax_type == "open-market":
-        return "Tax - Open Market"
-
+def _base_label(code: str, is_10b5_1: bool) -> str:
+    """Label precedence for non-tax rows; evaluated once per (code, plan)
+    pair at import time to build the _LABELS table below."""
     # Sales
     if code == "S":
         if is_10b5_1:
@@ -76,6 +56,52 @@ def classify(
     return "Unknown"
 
 
+# classify() runs once per row; precompute every (code, is_10b5_1) label so
+# the hot path is a single dict lookup instead of the branch chain above.
+_LABELS = {
+    (code, planned): _base_label(code, planned)
+    for code in "SPAMCGDFIEHJKLOUVWXZ"
+    for planned in (True, False)
+}
+
+
+def classify(
+    transaction_code: str,
+    is_10b5_1: bool,
+    tax_type: str = None
+) -> str:
+    """Classify a transaction and return human-readable label.
+
+    Args:
+        transaction_code: SEC transaction code (M, S, F, P, A, G, C, etc.)
+        is_10b5_1: Whether transaction is under a 10b5-1 plan
+        tax_type: "issuer", "open-market", or None
+
+    Returns:
+        Human-readable label string
+    """
+    # Tax takes highest priority regardless of code
+    if tax_type == "issuer":
+        return "Tax - Sale to Issuer"
+    if tax_type == "open-market":
+        return "Tax - Open Market"
+
+    return _LABELS.get(
+        ((transaction_code or "").upper(), bool(is_10b5_1)), "Unknown"
+    )
+
+
+# Exercise codes (M, C, X, O) and tax withholding codes (F, D)
+_LINK_ROLES = {
+    "M": "exercise",
+    "C": "exercise",
+    "X": "exercise",
+    "O": "exercise",
+    "F": "tax-sale-issuer",
+    "D": "tax-sale-issuer",
+}
+
+
 def get_link_role(
     transaction_code: str,
     tax_type: str = None
@@ -92,11 +118,7 @@ def get_link_role(
     """
     code = (transaction_code or "").upper()
 
-    # Exercise codes
-    if code in ("M", "C", "X", "O"):
-        return "exercise"
-
-    # Sales
+    # Sales are the only code where tax_type matters
     if code == "S":
         if tax_type == "issuer":
             return "tax-sale-issuer"
@@ -104,8 +126,4 @@ def get_link_role(
             return "tax-sale-open"
         return "sale-common"
 
-    # Tax withholding codes (F, D)
-    if code in ("F", "D"):
-        return "tax-sale-issuer"
-
-    return "other"
+    return _LINK_ROLES.get(code, "other")
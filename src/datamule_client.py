@@ -5,16 +5,65 @@ Two-step workflow:
 2. Submission tool -> Download and parse each filing with full data
 """
 
+import gzip
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 from typing import List, Optional, Dict, Any
 
 import requests
+import zstandard
 from dotenv import load_dotenv
 from datamule import Submission, format_accession
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson parses the wide 100-row API pages at C speed; fall back to stdlib
+# json when it isn't installed.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
 
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Shared session: keep-alive amortizes TLS handshakes across pages and
+# filings, and the adapter retries transient 5xx/429 responses with backoff.
+_SESSION = requests.Session()
+_SESSION.mount(
+    'https://',
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=64,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+        ),
+    ),
+)
+
+
+# Filings are immutable once filed, so cached SGML never goes stale
+_CACHE_DIR = Path('~/.cache/insider-app').expanduser()
+
+
+def _cache_write(path: Path, content: bytes) -> None:
+    """Best-effort atomic cache write (tmp file + rename)."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f'.tmp{os.getpid()}')
+        tmp.write_bytes(gzip.compress(content))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
 
 def get_api_key() -> str:
     """Get Datamule API key from environment."""
@@ -40,11 +89,13 @@ def get_filings_for_insider(
         List of accession numbers (deduplicated)
     """
     api_key = get_api_key()
-    all_accessions = []
-    page = 1
+    # Dedup inline while paging instead of accumulating everything and
+    # making a second pass; insertion order is preserved.
+    seen = set()
+    unique: List[str] = []
 
-    while True:
-        response = requests.get(
+    def _fetch_page(page: int) -> Dict[str, Any]:
+        response = _SESSION.get(
             'https://api.datamule.xyz/insider-transactions',
             params={
                 'table': 'reporting-owner',
@@ -56,49 +107,107 @@ def get_filings_for_insider(
             timeout=30
         )
         response.raise_for_status()
-        data = response.json()
-        records = data.get('data', [])
-
-        if not records:
-            break
+        return _json_loads(response.content)
 
-        all_accessions.extend([r['accessionNumber'] for r in records])
-
-        # Check pagination
-        total_pages = data.get('pagination', {}).get('totalPages', 1)
-        if page >= total_pages:
-            break
-        if max_pages and page >= max_pages:
-            break
+    # Prefetch page N+1 while page N's records are deduped, hiding one API
+    # round trip behind each batch of local work.
+    page = 1
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        future = prefetcher.submit(_fetch_page, page)
+        while True:
+            data = future.result()
+            records = data.get('data', [])
+
+            if not records:
+                break
+
+            # Check pagination before processing so the next request is
+            # already in flight while we dedup this page
+            total_pages = data.get('pagination', {}).get('totalPages', 1)
+            has_next = page < total_pages and not (max_pages and page >= max_pages)
+            if has_next:
+                future = prefetcher.submit(_fetch_page, page + 1)
+
+            for r in records:
+                acc = r['accessionNumber']
+                if acc not in seen:
+                    seen.add(acc)
+                    unique.append(acc)
+
+            if not has_next:
+                break
+            page += 1
 
-        page += 1
+    return unique
 
-    # Deduplicate while preserving order
-    seen = set()
-    unique = []
-    for acc in all_accessions:
-        if acc not in seen:
-            seen.add(acc)
-            unique.append(acc)
 
-    return unique
+# In-process memo for parsed filings: batch runs over several issuer CIKs
+# hit the same accessions, and filings are immutable so entries never go
+# stale. Failures are not memoized so transient errors can be retried.
+_filing_memo: Dict[str, Dict[str, Any]] = {}
 
 
-def get_filing_data(accession_number: str) -> Optional[Dict[str, Any]]:
+def get_filing_data(
+    accession_number: str,
+    use_cache: bool = True
+) -> Optional[Dict[str, Any]]:
     """Download and parse a single filing using Submission tool.
 
     Args:
         accession_number: The accession number (any format)
+        use_cache: Read/write the on-disk SGML and in-process caches
 
     Returns:
         The doc.data dict for the Form 4, or None if not found
     """
+    if use_cache:
+        hit = _filing_memo.get(str(accession_number))
+        if hit is not None:
+            # Shallow copy: callers tag/mutate the top-level dict
+            return dict(hit)
+
+    result = _fetch_filing_data(accession_number, use_cache)
+
+    if use_cache and result is not None:
+        _filing_memo[str(accession_number)] = dict(result)
+    return result
+
+
+def _fetch_filing_data(
+    accession_number: str,
+    use_cache: bool
+) -> Optional[Dict[str, Any]]:
+    """Fetch and parse one filing, consulting only the on-disk cache."""
     # Format accession for URL (18-digit, no dashes)
     acc_formatted = format_accession(str(accession_number), 'no-dash')
     url = f'https://sec-library.datamule.xyz/{acc_formatted}.sgml'
+    cache_path = _CACHE_DIR / f'{acc_formatted}.sgml.gz'
 
     try:
-        sub = Submission(url=url)
+        content = None
+        if use_cache and cache_path.exists():
+            try:
+                content = gzip.decompress(cache_path.read_bytes())
+            except OSError:
+                content = None  # corrupt/partial entry — refetch below
+
+        if content is None:
+            # Fetch over the pooled session (Submission's own url path opens
+            # a fresh urllib connection per filing) and hand it the raw SGML.
+            response = _SESSION.get(url, timeout=30)
+            response.raise_for_status()
+            content = response.content
+            # sec-library serves zstd-compressed SGML under this content type
+            if response.headers.get('Content-Type', '') == 'application/zstd':
+                content = (
+                    zstandard.ZstdDecompressor()
+                    .decompressobj()
+                    .decompress(content)
+                )
+            if use_cache:
+                _cache_write(cache_path, content)
+
+        sub = Submission(sgml_content=content, accession=acc_formatted)
 
         for doc in sub:
             if doc.type in ['3', '4', '5', '3/A', '4/A', '5/A']:
@@ -112,14 +221,16 @@ def get_filing_data(accession_number: str) -> Optional[Dict[str, Any]]:
         return None
 
     except Exception as e:
-        print(f"Error fetching {accession_number}: {e}")
+        logger.warning("Error fetching %s: %s", accession_number, e)
         return None
 
 
 def get_all_filings_data(
     rpt_owner_cik: int,
     max_filings: Optional[int] = None,
-    verbose: bool = True
+    verbose: bool = True,
+    max_workers: int = 16,
+    use_cache: bool = True
 ) -> List[Dict[str, Any]]:
     """Get full data for all filings for an insider.
 
@@ -127,13 +238,15 @@ def get_all_filings_data(
         rpt_owner_cik: The CIK of the reporting owner (insider)
         max_filings: Maximum filings to fetch (None = all)
         verbose: Print progress
+        max_workers: Concurrent download threads
+        use_cache: Read/write the on-disk SGML cache
 
     Returns:
-        List of filing data dicts
+        List of filing data dicts, in accession order
     """
     # Step 1: Get accession numbers
     if verbose:
-        print(f"Fetching accession numbers for CIK {rpt_owner_cik}...")
+        logger.info("Fetching accession numbers for CIK %s...", rpt_owner_cik)
 
     accessions = get_filings_for_insider(rpt_owner_cik)
 
@@ -141,19 +254,41 @@ def get_all_filings_data(
         accessions = accessions[:max_filings]
 
     if verbose:
-        print(f"Found {len(accessions)} filings")
-
-    # Step 2: Download each filing
-    filings = []
-    for i, acc in enumerate(accessions):
-        if verbose:
-            print(f"  [{i+1}/{len(accessions)}] Fetching {acc}...")
-
-        filing_data = get_filing_data(acc)
-        if filing_data:
-            filings.append(filing_data)
+        logger.info("Found %d filings", len(accessions))
+
+    # Step 2: Download filings concurrently (latency-bound); each result is
+    # written into its input slot so output order matches accession order
+    results: List[Optional[Dict[str, Any]]] = [None] * len(accessions)
+    if accessions:
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(accessions))
+        ) as executor:
+            futures = {
+                executor.submit(get_filing_data, acc, use_cache): i
+                for i, acc in enumerate(accessions)
+            }
+            done = 0
+            for future in as_completed(futures):
+                i = futures[future]
+                results[i] = future.result()
+                done += 1
+                if verbose:
+                    # Lazy %-formatting: no string is built when INFO is off
+                    logger.info(
+                        "  [%d/%d] Fetched %s", done, len(accessions), accessions[i]
+                    )
+
+    # Single C-speed pass over the pre-sized results list
+    filings = [f for f in results if f is not None]
 
     if verbose:
-        print(f"Successfully fetched {len(filings)} filings")
+        dropped = len(results) - len(filings)
+        if dropped:
+            logger.info(
+                "Successfully fetched %d filings (%d failed or skipped)",
+                len(filings), dropped
+            )
+        else:
+            logger.info("Successfully fetched %d filings", len(filings))
 
     return filings
@@ -1,8 +1,9 @@
 """Export processed transactions to CSV."""
 
-import csv
 from typing import List, Dict, Any
 
+import pandas as pd
+
 
 # Column order for CSV output
 COLUMN_ORDER = [
@@ -65,6 +66,14 @@ COLUMN_ORDER = [
     'footnote',
 ]
 
+# Frozen once at import: to_csv consults membership per export call, and the
+# ordered list never changes at runtime.
+_COLUMN_ORDER_SET = frozenset(COLUMN_ORDER)
+
+# Types to_dict_list passes through unchanged; everything else is str()ed.
+# Exact-type lookup, so bool (a subclass of int) is listed explicitly.
+_JSON_PASS_TYPES = {int, float, str, bool, list, type(None)}
+
 
 def to_csv(
     transactions: List[Dict[str, Any]],
@@ -82,45 +91,40 @@ def to_csv(
         print("No transactions to export")
         return
 
-    # Sort transactions: newest filedDate first, grouped by accessionNumber
-    def sort_key(txn):
-        filed_date = str(txn.get('filedDate', '') or '')
-        accession = str(txn.get('accessionNumber', '') or '')
-        return (filed_date, accession)
-
-    transactions = sorted(transactions, key=sort_key, reverse=True)
-
-    # Determine columns
+    # dtype=object keeps cell values exactly as the parser produced them;
+    # to_csv still serializes the frame in C instead of a per-row Python loop
+    df = pd.DataFrame(transactions, dtype=object)
+
+    # Sort: newest filedDate first, grouped by accessionNumber. Key columns
+    # are stringified once up front (not per comparison), matching the old
+    # sort_key closure's values; the stable sort keeps ties in input order.
+    by = []
+    for col in ('filedDate', 'accessionNumber'):
+        key = '_sort_' + col
+        df[key] = df[col].fillna('').astype(str) if col in df.columns else ''
+        by.append(key)
+    df = df.sort_values(by, ascending=False, kind='stable').drop(columns=by)
+
+    # Determine columns. The key union across rows was already computed by
+    # the DataFrame constructor in its single materialization pass, so no
+    # separate O(n) key scan is needed here.
     if include_all_columns:
         # Start with ordered columns, add any extras
-        all_keys = set()
-        for txn in transactions:
-            all_keys.update(txn.keys())
-
-        columns = [c for c in COLUMN_ORDER if c in all_keys]
-        extra_columns = sorted(all_keys - set(columns))
-        columns.extend(extra_columns)
+        columns = [c for c in COLUMN_ORDER if c in df.columns]
+        # Underscore-prefixed keys are internal working fields (e.g. the
+        # parser's filing-order index), never exported
+        columns.extend(sorted(
+            c for c in set(df.columns) - _COLUMN_ORDER_SET
+            if not c.startswith('_')
+        ))
+        df = df[columns]
     else:
-        columns = COLUMN_ORDER
-
-    # Write CSV
-    with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
-        writer.writeheader()
-
-        for txn in transactions:
-            # Convert lists to strings (e.g., footnotes)
-            row = {}
-            for key, value in txn.items():
-                if isinstance(value, list):
-                    row[key] = ' | '.join(str(v) for v in value)
-                elif isinstance(value, bool):
-                    row[key] = str(value)
-                else:
-                    row[key] = value
-            writer.writerow(row)
+        df = df.reindex(columns=COLUMN_ORDER)
 
-    print(f"Exported {len(transactions)} rows to {filepath}")
+    # List-valued fields (footnotes) are joined to strings at parse time,
+    # so the frame is written as-is with no per-cell conversion pass
+    df.to_csv(filepath, index=False, encoding='utf-8-sig')
+    print(f"Exported {len(df)} rows to {filepath}")
 
 
 def to_dict_list(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -132,16 +136,11 @@ def to_dict_list(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     Returns:
         Same list, cleaned for JSON serialization
     """
-    result = []
-    for txn in transactions:
-        row = {}
-        for key, value in txn.items():
-            # Convert non-serializable types
-            if value is None:
-                row[key] = None
-            elif isinstance(value, (int, float, str, bool, list)):
-                row[key] = value
-            else:
-                row[key] = str(value)
-        result.append(row)
-    return result
+    # One exact-type set lookup per cell replaces the old isinstance chain
+    return [
+        {
+            key: value if type(value) in _JSON_PASS_TYPES else str(value)
+            for key, value in txn.items()
+        }
+        for txn in transactions
+    ]
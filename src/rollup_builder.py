@@ -7,14 +7,19 @@ Groups exercise transactions with related sales:
 - Creates ROLLUP summary rows for Exercise-Sale and Automatic Disposition
 """
 
+from operator import itemgetter
 from typing import Dict, List, Any, Tuple
-from copy import deepcopy
 
 
 # Tolerance for matching exercise to sales
 TOLERANCE_ABSOLUTE = 5  # shares
 TOLERANCE_PERCENT = 0.005  # 0.5%
 
+# Rows carry a '_order' filing-order index from parse_filing; sorting on it
+# is a C-level field fetch instead of an id()-keyed dict probe per compare.
+_order_key = itemgetter('_order')
+_waterfall_key = itemgetter('_section', '_order')
+
 
 def _calculate_match_status(
     exercise_est: float,
@@ -40,12 +45,21 @@ def _calculate_match_status(
         return "MISMATCH", match_delta, False
 
 
-def _get_filing_order_index(transactions: List[Dict], txn: Dict) -> int:
-    """Get the original filing order index for a transaction."""
-    try:
-        return transactions.index(txn)
-    except ValueError:
-        return 9999
+def _expand_ranges(row, dmin, dmax, pmin, pmax):
+    """Fold a row's date and price into running min/max trackers."""
+    d = row.get('transactionDate')
+    if d:
+        if dmin is None or d < dmin:
+            dmin = d
+        if dmax is None or d > dmax:
+            dmax = d
+    p = row.get('transactionPricePerShare')
+    if p is not None:
+        if pmin is None or p < pmin:
+            pmin = p
+        if pmax is None or p > pmax:
+            pmax = p
+    return dmin, dmax, pmin, pmax
 
 
 def build_rollups(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -65,26 +79,38 @@ def build_rollups(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     if not transactions:
         return []
 
-    # Keep original order for reference
-    original_order = {id(t): i for i, t in enumerate(transactions)}
-
-    # Separate by link role
-    exercises = [t for t in transactions if t.get('linkRole') == 'exercise']
-    sales_common = [t for t in transactions if t.get('linkRole') == 'sale-common']
-    tax_rows = [t for t in transactions if t.get('linkRole') in ('tax-sale-issuer', 'tax-sale-open')]
-    other_rows = [t for t in transactions if t.get('linkRole') == 'other']
-
-    # If no exercises, return original list in filing order (no rollups)
+    # Separate by link role in one pass, folding the Method A estimate
+    # (non-derivative exercise acquisitions) into the same sweep
+    exercises: List[Dict] = []
+    sales_common: List[Dict] = []
+    tax_rows: List[Dict] = []
+    other_rows: List[Dict] = []
+    underlying_a = 0.0
+    for t in transactions:
+        role = t.get('linkRole')
+        if role == 'exercise':
+            exercises.append(t)
+            if t.get('secTable') == 'Table 1' and t.get('_adCodeU') == 'A':
+                underlying_a += abs(t.get('transactionShares') or 0)
+        elif role == 'sale-common':
+            sales_common.append(t)
+        elif role in ('tax-sale-issuer', 'tax-sale-open'):
+            tax_rows.append(t)
+        elif role == 'other':
+            other_rows.append(t)
+
+    # If no exercises, return the list as-is (no rollups): parse_filing
+    # emits rows in filing order and grouping preserves it, so there is
+    # nothing to re-sort
     if not exercises:
         for t in transactions:
             t['rowType'] = 'SOURCE'
-        return sorted(transactions, key=lambda x: original_order.get(id(x), 9999))
+        return transactions
 
     # Get accession from first transaction
     accession = str(transactions[0].get('accessionNumber', ''))
 
     # Track processed items
-    processed_sales = set()  # IDs of fully processed sales
     synthetic_rows: List[Dict] = []  # Split rows we create
 
     # Collect all exercises and linked sales for the Exercise rollup
@@ -94,20 +120,20 @@ def build_rollups(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     total_sale_value = 0.0
     exercise_method = "UNKNOWN"
 
+    # Event-wide aggregates accumulate inline as rows join the event,
+    # replacing several post-link passes over the combined row lists
+    dmin = dmax = None
+    pmin = pmax = None
+    linked_sum_shares = 0.0
+    any_linked_10b5 = False
+
     # Process all exercises together (Option B - combined)
     for ex in exercises:
         all_exercise_rows.append(ex)
+        dmin, dmax, pmin, pmax = _expand_ranges(ex, dmin, dmax, pmin, pmax)
 
     # Calculate total exercise estimate
-    # Method A: Sum of non-derivative acquisitions
-    underlying_a = sum(
-        abs(t.get('transactionShares') or 0)
-        for t in transactions
-        if t.get('secTable') == 'Table 1'
-        and (t.get('transactionAcquiredDisposedCode') or '').upper() == 'A'
-        and t.get('linkRole') == 'exercise'
-    )
-
+    # Method A: Sum of non-derivative acquisitions (accumulated above)
     if underlying_a > 0:
         total_exercise_est = underlying_a
         exercise_method = "UNDERLYING_A"
@@ -116,11 +142,17 @@ def build_rollups(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         total_exercise_est = sum(abs(t.get('transactionShares') or 0) for t in exercises)
         exercise_method = "DERV_1to1" if total_exercise_est > 0 else "UNKNOWN"
 
-    # Link sales greedily in filing order
+    # Link sales greedily in filing order. The share arithmetic could be
+    # vectorized (cumsum + bisect for the split point), but every linked
+    # sale's dict must be touched anyway for label/event updates and the
+    # inline aggregates, so the per-sale loop stays.
     remaining = total_exercise_est
-    sales_in_order = sorted(sales_common, key=lambda x: original_order.get(id(x), 9999))
+    sales_in_order = sorted(sales_common, key=_order_key)
+    # One byte per sale, indexed by position in sales_in_order; marks sales
+    # consumed by the linking pass (fully linked or split)
+    processed_mask = bytearray(len(sales_in_order))
 
-    for sale in sales_in_order:
+    for sale_idx, sale in enumerate(sales_in_order):
         if remaining <= 0:
             break
 
@@ -132,13 +164,17 @@ def build_rollups(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
 
         if sale_shares <= remaining:
             # Fully link this sale
-            processed_sales.add(id(sale))
+            processed_mask[sale_idx] = 1
 
             # Upgrade label if 10b5-1 and linked to exercise
             if sale.get('is10b5_1') and sale.get('label') == '10b5-1 Planned Sale':
                 sale['label'] = '10b5-1 Planned Sale (Derivative)'
 
             all_linked_sales.append(sale)
+            linked_sum_shares += sale_shares
+            if sale.get('is10b5_1'):
+                any_linked_10b5 = True
+            dmin, dmax, pmin, pmax = _expand_ranges(sale, dmin, dmax, pmin, pmax)
 
             if sale_price is not None:
                 total_sale_value += sale_shares * sale_price
@@ -151,7 +187,10 @@ def build_rollups(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             residual_amount = sale_shares - remaining
 
             # Create SYNTHETIC linked portion
-            sale_linked = deepcopy(sale)
+            sale_linked = sale.copy()
+            # Fractional offsets keep the split pair in place of the parent,
+            # linked portion first
+            sale_linked['_order'] = sale['_order'] + 0.1
             sale_linked['transactionShares'] = linked_amount
             sale_linked['signedShares'] = -linked_amount
             sale_linked['rowType'] = 'SYNTHETIC'
@@ -163,12 +202,19 @@ def build_rollups(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
 
             all_linked_sales.append(sale_linked)
             synthetic_rows.append(sale_linked)
+            linked_sum_shares += linked_amount
+            if sale_linked.get('is10b5_1'):
+                any_linked_10b5 = True
+            dmin, dmax, pmin, pmax = _expand_ranges(
+                sale_linked, dmin, dmax, pmin, pmax
+            )
 
             if sale_price is not None:
                 total_sale_value += linked_amount * sale_price
 
             # Create SYNTHETIC residual portion
-            sale_residual = deepcopy(sale)
+            sale_residual = sale.copy()
+            sale_residual['_order'] = sale['_order'] + 0.2
             sale_residual['transactionShares'] = residual_amount
             sale_residual['signedShares'] = -residual_amount
             sale_residual['rowType'] = 'SYNTHETIC'
@@ -179,13 +225,12 @@ def build_rollups(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             synthetic_rows.append(sale_residual)
 
             # Mark original as processed (it's replaced by two synthetics)
-            processed_sales.add(id(sale))
+            processed_mask[sale_idx] = 1
 
             remaining = 0
             break
 
-    # Calculate match status
-    linked_sum_shares = sum(abs(s.get('transactionShares') or 0) for s in all_linked_sales)
+    # Calculate match status (linked shares summed during the linking loop)
     match_status, match_delta, tolerance_used = _calculate_match_status(
         total_exercise_est, linked_sum_shares
     )
@@ -193,15 +238,11 @@ def build_rollups(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     # Determine aggregate type for exercise rollup
     aggregate_type = "Exercise - Sale" if linked_sum_shares > 0 else "Exercise - Hold"
 
-    # Calculate date and price ranges for exercise rollup
-    all_dates = [t.get('transactionDate') for t in all_exercise_rows + all_linked_sales if t.get('transactionDate')]
-    all_prices = [t.get('transactionPricePerShare') for t in all_exercise_rows + all_linked_sales
-                  if t.get('transactionPricePerShare') is not None]
-
-    trade_date_start = min(all_dates) if all_dates else ''
-    trade_date_end = max(all_dates) if all_dates else ''
-    price_range_min = min(all_prices) if all_prices else None
-    price_range_max = max(all_prices) if all_prices else None
+    # Date and price ranges were tracked inline as rows joined the event
+    trade_date_start = dmin if dmin is not None else ''
+    trade_date_end = dmax if dmax is not None else ''
+    price_range_min = pmin
+    price_range_max = pmax
 
     # Check for tax rows
     has_tax_rows = len(tax_rows) > 0
@@ -250,7 +291,7 @@ def build_rollups(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         'transactionAcquiredDisposedCode': 'D',
         'transactionValue': total_sale_value if linked_sum_shares else None,
         'signedShares': -abs(linked_sum_shares) if linked_sum_shares else 0,
-        'is10b5_1': any(s.get('is10b5_1') for s in all_linked_sales),
+        'is10b5_1': any_linked_10b5,
         'isTax': False,
         'taxType': None,
         'label': aggregate_type,
@@ -258,28 +299,36 @@ def build_rollups(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         'secTable': 'Table 1',
     }
 
-    # Mark exercise and linked sales with event ID
+    # Mark exercise and linked sales with event ID, tagging each row's
+    # waterfall section for the single output sort below
     for row in all_exercise_rows:
         row['eventId'] = event_id_exercise
         row['rowType'] = 'SOURCE'
+        row['_section'] = 1 if row.get('secTable') == 'Table 2' else 2
+
+    # id() sets make the split-row membership tests single hash probes
+    # instead of linear scans with per-element dict comparison
+    synthetic_ids = {id(r) for r in synthetic_rows}
+    linked_ids = {id(r) for r in all_linked_sales}
 
     for row in all_linked_sales:
         row['eventId'] = event_id_exercise
-        if row not in synthetic_rows:
+        row['_section'] = 3
+        if id(row) not in synthetic_ids:
             row['rowType'] = 'SOURCE'
 
     # Collect unlinked sales (including synthetic residuals)
     unlinked_sales: List[Dict] = []
 
-    # Add unprocessed original sales
-    for sale in sales_common:
-        if id(sale) not in processed_sales:
+    # Add unprocessed original sales (sales_in_order matches filing order)
+    for sale, done in zip(sales_in_order, processed_mask):
+        if not done:
             sale['rowType'] = 'SOURCE'
             unlinked_sales.append(sale)
 
     # Add synthetic residuals (not linked)
     for syn in synthetic_rows:
-        if syn not in all_linked_sales:
+        if id(syn) not in linked_ids:
             unlinked_sales.append(syn)
 
     # Build Automatic Disposition rollup if there are unlinked sales
@@ -348,53 +397,32 @@ def build_rollups(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         # Mark unlinked sales with auto disposition event ID
         for row in unlinked_sales:
             row['eventId'] = event_id_auto
+            row['_section'] = 5
 
-    # Build output in waterfall order
-    output: List[Dict[str, Any]] = []
-
-    # 1. Exercise rollup
-    output.append(exercise_rollup)
-
-    # 2. Exercise SOURCE rows: Table 2 (derivative) first, then Table 1 (non-derivative), in filing order
-    derivative_exercises = sorted(
-        [r for r in all_exercise_rows if r.get('secTable') == 'Table 2'],
-        key=lambda x: original_order.get(id(x), 9999)
-    )
-    non_derivative_exercises = sorted(
-        [r for r in all_exercise_rows if r.get('secTable') == 'Table 1'],
-        key=lambda x: original_order.get(id(x), 9999)
-    )
-    output.extend(derivative_exercises)
-    output.extend(non_derivative_exercises)
-
-    # 3. Linked sales in filing order
-    linked_sales_ordered = sorted(
-        all_linked_sales,
-        key=lambda x: original_order.get(id(x), 9999) if id(x) in original_order else 9999
-    )
-    output.extend(linked_sales_ordered)
-
-    # 4. Automatic Disposition rollup (if exists)
-    if auto_disp_rollup:
-        output.append(auto_disp_rollup)
-
-        # 5. Unlinked sales in filing order
-        unlinked_sales_ordered = sorted(
-            unlinked_sales,
-            key=lambda x: original_order.get(id(x), 9999) if id(x) in original_order else 9999
-        )
-        output.extend(unlinked_sales_ordered)
-
-    # 6. Tax rows (in filing order)
+    # Tax and other rows pass through after the roll-up sections
     for row in tax_rows:
         row['rowType'] = 'SOURCE'
-    tax_rows_ordered = sorted(tax_rows, key=lambda x: original_order.get(id(x), 9999))
-    output.extend(tax_rows_ordered)
-
-    # 7. Other rows (in filing order)
+        row['_section'] = 6
     for row in other_rows:
         row['rowType'] = 'SOURCE'
-    other_rows_ordered = sorted(other_rows, key=lambda x: original_order.get(id(x), 9999))
-    output.extend(other_rows_ordered)
+        row['_section'] = 7
+
+    # Build output in waterfall order with one stable sort on
+    # (section, filing order): exercise rollup, Table 2 then Table 1
+    # exercises, linked sales, auto-disposition rollup, unlinked sales,
+    # tax rows, other rows.
+    exercise_rollup['_section'] = 0
+    exercise_rollup['_order'] = 0
+    output: List[Dict[str, Any]] = [exercise_rollup]
+    output.extend(all_exercise_rows)
+    output.extend(all_linked_sales)
+    if auto_disp_rollup:
+        auto_disp_rollup['_section'] = 4
+        auto_disp_rollup['_order'] = 0
+        output.append(auto_disp_rollup)
+        output.extend(unlinked_sales)
+    output.extend(tax_rows)
+    output.extend(other_rows)
+    output.sort(key=_waterfall_key)
 
     return output
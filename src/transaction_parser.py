@@ -7,6 +7,7 @@ Takes doc.data from Datamule Submission and extracts:
 """
 
 import re
+from sys import intern
 from typing import Dict, List, Any, Optional
 
 from .classifier import classify, get_link_role
@@ -113,38 +114,35 @@ def _get_footnotes(transaction: Dict) -> List[str]:
     return footnotes
 
 
-def _detect_10b5_1(footnotes: List[str]) -> bool:
-    """Check if footnotes indicate a 10b5-1 plan."""
-    for fn in footnotes:
-        if RULE_10B5_1_RE.search(fn):
-            return True
-    return False
+def _detect_10b5_1(footnote_text: str) -> bool:
+    """Check if footnote text indicates a 10b5-1 plan."""
+    return RULE_10B5_1_RE.search(footnote_text) is not None
 
 
 def _detect_tax_type(
-    transaction_code: str,
-    footnotes: List[str],
+    code_u: str,
+    footnote_text: str,
     price_present: bool
 ) -> Optional[str]:
-    """Detect tax type from code and footnotes.
+    """Detect tax type from code and footnote text.
 
     Returns:
         "issuer" - tax withholding to issuer
         "open-market" - sell-to-cover on open market
         None - not a tax transaction
     """
-    code = (transaction_code or "").upper()
-
-    # Code F or D is always tax to issuer
-    if code in ("F", "D"):
+    # Code F or D is always tax to issuer (code_u arrives uppercased),
+    # no footnote scan needed
+    if code_u in ("F", "D"):
         return "issuer"
 
-    # Check footnotes for tax keywords
-    footnote_text = " ".join(footnotes)
+    # Check footnotes for tax keywords. TAX_RE and ISSUER_RE stay separate
+    # searches: phrases like "withheld by the issuer" must set both flags,
+    # which a single fused alternation cannot express.
     has_tax_keywords = TAX_RE.search(footnote_text) is not None
     has_issuer_keywords = ISSUER_RE.search(footnote_text) is not None
 
-    if code == "S" and has_tax_keywords and price_present and not has_issuer_keywords:
+    if code_u == "S" and has_tax_keywords and price_present and not has_issuer_keywords:
         return "open-market"
 
     if has_tax_keywords and has_issuer_keywords:
@@ -175,40 +173,39 @@ def _parse_transaction(
     issuer_info: Dict,
     owner_info: Dict,
     accession_number: str,
-    filed_date: str = ''
+    filed_date: str = '',
+    filing_url: str = ''
 ) -> Dict[str, Any]:
     """Parse a single transaction into a row dict."""
 
-    # Extract Datamule native fields
-    transaction_code = _get_nested_value(
-        transaction, 'transactionCoding', 'transactionCode', default=''
-    )
-    transaction_date = _get_nested_value(
-        transaction, 'transactionDate', 'value', default=''
-    )
-    security_title = _get_nested_value(
-        transaction, 'securityTitle', 'value', default=''
-    )
-    shares_raw = _get_nested_value(
-        transaction, 'transactionAmounts', 'transactionShares', 'value'
-    )
-    price_raw = _get_nested_value(
-        transaction, 'transactionAmounts', 'transactionPricePerShare', 'value'
-    )
-    acq_disp = _get_nested_value(
-        transaction, 'transactionAmounts', 'transactionAcquiredDisposedCode', 'value', default=''
+    # Extract Datamule native fields. These paths have fixed shapes, so
+    # chained .get calls avoid a helper-function frame per field;
+    # _get_nested_value remains for footnotes where shapes vary.
+    amounts = transaction.get('transactionAmounts') or {}
+    transaction_code = (
+        (transaction.get('transactionCoding') or {}).get('transactionCode') or ''
     )
-    shares_after_raw = _get_nested_value(
-        transaction, 'postTransactionAmounts', 'sharesOwnedFollowingTransaction', 'value'
-    )
-    direct_indirect = _get_nested_value(
-        transaction, 'ownershipNature', 'directOrIndirectOwnership', 'value', default=''
+    transaction_date = (transaction.get('transactionDate') or {}).get('value') or ''
+    security_title = (transaction.get('securityTitle') or {}).get('value') or ''
+    shares_raw = (amounts.get('transactionShares') or {}).get('value')
+    price_raw = (amounts.get('transactionPricePerShare') or {}).get('value')
+    acq_disp = (
+        (amounts.get('transactionAcquiredDisposedCode') or {}).get('value') or ''
     )
+    shares_after_raw = (
+        (transaction.get('postTransactionAmounts') or {})
+        .get('sharesOwnedFollowingTransaction') or {}
+    ).get('value')
+    direct_indirect = (
+        (transaction.get('ownershipNature') or {})
+        .get('directOrIndirectOwnership') or {}
+    ).get('value') or ''
 
     # For derivatives, also check underlying shares
-    underlying_shares_raw = _get_nested_value(
-        transaction, 'underlyingSecurity', 'underlyingSecurityShares', 'value'
-    )
+    underlying_shares_raw = (
+        (transaction.get('underlyingSecurity') or {})
+        .get('underlyingSecurityShares') or {}
+    ).get('value')
 
     # Parse numeric values
     shares = _parse_float(shares_raw)
@@ -220,22 +217,29 @@ def _parse_transaction(
     if (shares is None or shares == 0) and underlying_shares:
         shares = underlying_shares
 
-    # Get footnotes
+    # Get footnotes; joined once so every detector scans a single string
     footnotes = _get_footnotes(transaction)
+    footnote_text = " ".join(footnotes)
 
     # Calculate fields
     price_present = price is not None and price > 0
 
+    # Canonicalize the code fields once; they are compared repeatedly below
+    # and again in the roll-up builder. Interning these tiny-domain values
+    # lets those == checks hit CPython's pointer-identity fast path.
+    code_u = intern((transaction_code or '').upper())
+    acq_disp_u = intern((acq_disp or '').upper())
+
     # Signed shares (positive for acquire, negative for dispose)
     signed_shares = shares
     if shares is not None:
-        if acq_disp.upper() == "D":
+        if acq_disp_u == "D":
             signed_shares = -abs(shares)
-        elif acq_disp.upper() == "A":
+        elif acq_disp_u == "A":
             signed_shares = abs(shares)
         else:
             # Fallback based on code
-            if (transaction_code or "").upper() in ("S", "F", "G"):
+            if code_u in ("S", "F", "G"):
                 signed_shares = -abs(shares)
             else:
                 signed_shares = abs(shares)
@@ -246,20 +250,17 @@ def _parse_transaction(
         transaction_value = round(abs(shares) * price, 2)
 
     # Detection
-    is_10b5_1 = _detect_10b5_1(footnotes)
-    tax_type = _detect_tax_type(transaction_code, footnotes, price_present)
+    is_10b5_1 = _detect_10b5_1(footnote_text)
+    tax_type = _detect_tax_type(code_u, footnote_text, price_present)
     is_tax = tax_type is not None
 
     # Classification
-    label = classify(transaction_code, is_10b5_1, tax_type)
-    link_role = get_link_role(transaction_code, tax_type)
+    label = classify(code_u, is_10b5_1, tax_type)
+    link_role = get_link_role(code_u, tax_type)
 
     # Plan adoption date (only if 10b5-1)
     plan_adoption_date = _extract_adoption_date(footnotes) if is_10b5_1 else None
 
-    # Build SEC filing URL
-    filing_url = _build_sec_filing_url(issuer_info.get('issuerCik', ''), accession_number)
-
     # Build row with Datamule native names + calculated fields
     return {
         # Datamule native fields
@@ -280,7 +281,9 @@ def _parse_transaction(
         'transactionAcquiredDisposedCode': acq_disp,
         'sharesOwnedFollowingTransaction': shares_after,
         'directOrIndirectOwnership': direct_indirect,
-        'footnote': footnotes,
+        # Joined here so export can write rows as-is instead of rebuilding
+        # each dict to stringify lists
+        'footnote': ' | '.join(str(x) for x in footnotes),
 
         # Calculated fields
         'transactionValue': transaction_value,
@@ -294,6 +297,8 @@ def _parse_transaction(
         'secTable': 'Table 2' if is_derivative else 'Table 1',
         'rowType': 'SOURCE',
         'eventId': None,  # Set by rollup builder
+        '_order': 0,  # Filing-order index, set by parse_filing
+        '_adCodeU': acq_disp_u,  # Pre-uppercased for the roll-up builder
     }
 
 
@@ -330,6 +335,12 @@ def parse_filing(filing_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         'officerTitle': owner_relationship.get('officerTitle', ''),
     }
 
+    # The URL only depends on issuer and accession, so build it once per
+    # filing rather than once per transaction
+    filing_url = _build_sec_filing_url(
+        issuer_info.get('issuerCik', ''), accession_number
+    )
+
     rows = []
 
     # Parse non-derivative transactions
@@ -341,8 +352,10 @@ def parse_filing(filing_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         row = _parse_transaction(
             txn, is_derivative=False,
             issuer_info=issuer_info, owner_info=owner_info,
-            accession_number=accession_number, filed_date=filed_date
+            accession_number=accession_number, filed_date=filed_date,
+            filing_url=filing_url
         )
+        row['_order'] = len(rows)
         rows.append(row)
 
     # Parse derivative transactions
@@ -354,8 +367,10 @@ def parse_filing(filing_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         row = _parse_transaction(
             txn, is_derivative=True,
             issuer_info=issuer_info, owner_info=owner_info,
-            accession_number=accession_number, filed_date=filed_date
+            accession_number=accession_number, filed_date=filed_date,
+            filing_url=filing_url
         )
+        row['_order'] = len(rows)
         rows.append(row)
 
     return rows
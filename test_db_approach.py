@@ -12,10 +12,89 @@ if the DB API provides all the fields we need:
 import os
 import json
 import requests
+from concurrent.futures import ThreadPoolExecutor
+
+from cache import FileCache
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson parses and pretty-prints at C speed; stdlib json is the fallback
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_pretty(obj):
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2, default=str
+        ).decode()
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_pretty(obj):
+        return json.dumps(obj, indent=2, default=str)
 
 load_dotenv()
 
+# Shared session: keep-alive reuses one TLS handshake across the script's
+# ~8 probes, the adapter retries transient 429/5xx with backoff, and the
+# verbose JSON bodies come back gzipped.
+SESSION = requests.Session()
+SESSION.mount(
+    'https://',
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+        ),
+    ),
+)
+# Advertise brotli only when the decoder is installed — urllib3 cannot
+# decompress br bodies without it; gzip is always safe to request
+try:
+    import brotli  # noqa: F401
+    SESSION.headers.update({'Accept-Encoding': 'br, gzip'})
+except ImportError:
+    SESSION.headers.update({'Accept-Encoding': 'gzip'})
+
+# Responses are cached on disk (keyed by URL + params, api_key excluded)
+# so reruns against the same fixed CIK/accession skip the network entirely
+CACHE = FileCache(root='.cache', ttl=24 * 3600)
+
+DB_API_URL = 'https://api.datamule.xyz/insider-transactions'
+
+
+def cached_get(params, url=DB_API_URL):
+    """GET returning parsed JSON, served from the disk cache when fresh."""
+    keyed = {k: v for k, v in params.items() if k != 'api_key'}
+    key = url + '?' + json.dumps(keyed, sort_keys=True, default=str)
+    subdir = str(keyed.get('table', ''))
+    payload = CACHE.get(key, subdir)
+    if payload is not None:
+        return payload
+    response = SESSION.get(url, params=params, timeout=30)
+    response.raise_for_status()
+    payload = _json_loads(response.content)
+    CACHE.set(key, payload, subdir)
+    return payload
+
+
+# Fields the pipeline actually consumes. If the DB API grows a projection
+# parameter (e.g. fields=...), passing ','.join(KEY_FIELDS) would shrink
+# payloads for non-discovery queries; the table probes below deliberately
+# fetch full rows because their purpose is learning each table's schema.
+KEY_FIELDS = {
+    'aff10b5One': '10b5-1 plan indicator',
+    'transactionCode': 'Transaction type (P, S, A, F, etc.)',
+    'footnote': 'Footnote text',
+    'transactionPricePerShare': 'Price per share',
+    'transactionShares': 'Number of shares',
+    'transactionAcquiredDisposedCode': 'Acquire/Dispose indicator',
+}
+
 
 def get_api_key():
     key = os.environ.get('DATAMULE_API_KEY')
@@ -24,10 +103,23 @@ def get_api_key():
     return key
 
 
+# Resolved once at import and attached to the session, so every request
+# carries the credential without each call site rebuilding it
+API_KEY = get_api_key()
+SESSION.params = {'api_key': API_KEY}
+
+
+def _print_record(rec, max_len=None):
+    """Print a record's fields in sorted key order, one per line."""
+    for k in sorted(rec):
+        val_str = str(rec[k])
+        if max_len and len(val_str) > max_len:
+            val_str = val_str[:max_len] + "..."
+        print(f"  {k}: {val_str}")
+
+
 def test_db_api_tables():
     """Test querying different DB tables to see available fields."""
-    api_key = get_api_key()
-
     # Test with a known insider CIK (Amrita from previous tests)
     test_cik = 1765417
 
@@ -42,55 +134,60 @@ def test_db_api_tables():
 
     results = {}
 
-    for table in tables:
+    def probe(table):
+        """Fetch one table's sample page; returns (table, data, error)."""
+        try:
+            data = cached_get({
+                'table': table,
+                'rptOwnerCik': test_cik,
+                'page': 1,
+                'pageSize': 1  # One record is enough to see the schema
+            })
+            return table, data, None
+        except Exception as e:
+            return table, None, e
+
+    # The probes are independent and network-bound, so fire them all at
+    # once; ex.map keeps results in table order so output doesn't interleave
+    with ThreadPoolExecutor(max_workers=len(tables)) as ex:
+        probed = list(ex.map(probe, tables))
+
+    for table, data, error in probed:
         print(f"\n{'='*60}")
         print(f"Testing table: {table}")
         print('='*60)
 
-        try:
-            response = requests.get(
-                'https://api.datamule.xyz/insider-transactions',
-                params={
-                    'table': table,
-                    'rptOwnerCik': test_cik,
-                    'page': 1,
-                    'pageSize': 5,  # Just get a few for inspection
-                    'api_key': api_key
-                },
-                timeout=30
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            records = data.get('data', [])
-            pagination = data.get('pagination', {})
-
-            print(f"Total records: {pagination.get('total', 'N/A')}")
-            print(f"Sample records: {len(records)}")
-
-            if records:
-                # Show all fields in first record
-                print("\nFields in first record:")
-                first_record = records[0]
-                for key, value in sorted(first_record.items()):
-                    # Truncate long values
-                    val_str = str(value)
-                    if len(val_str) > 100:
-                        val_str = val_str[:100] + "..."
-                    print(f"  {key}: {val_str}")
-
-                results[table] = {
-                    'fields': list(first_record.keys()),
-                    'sample': first_record,
-                    'total': pagination.get('total', 0)
-                }
-            else:
-                print("No records found")
-                results[table] = {'fields': [], 'sample': None, 'total': 0}
-
-        except Exception as e:
-            print(f"Error: {e}")
-            results[table] = {'error': str(e)}
+        if error is not None:
+            print(f"Error: {error}")
+            results[table] = {'error': str(error)}
+            continue
+
+        records = data.get('data', [])
+        pagination = data.get('pagination', {})
+
+        print(f"Total records: {pagination.get('total', 'N/A')}")
+        print(f"Sample records: {len(records)}")
+
+        if records:
+            # Show all fields in first record
+            print("\nFields in first record:")
+            first_record = records[0]
+            _print_record(first_record, max_len=100)
+
+            results[table] = {
+                'fields': list(first_record.keys()),
+                'fields_set': frozenset(first_record),
+                'sample': first_record,
+                'total': pagination.get('total', 0)
+            }
+        else:
+            print("No records found")
+            results[table] = {
+                'fields': [],
+                'fields_set': frozenset(),
+                'sample': None,
+                'total': 0
+            }
 
     return results
 
@@ -101,20 +198,11 @@ def check_key_fields(results):
     print("KEY FIELD ANALYSIS")
     print("="*60)
 
-    key_fields = {
-        'aff10b5One': '10b5-1 plan indicator',
-        'transactionCode': 'Transaction type (P, S, A, F, etc.)',
-        'footnote': 'Footnote text',
-        'transactionPricePerShare': 'Price per share',
-        'transactionShares': 'Number of shares',
-        'transactionAcquiredDisposedCode': 'Acquire/Dispose indicator',
-    }
-
-    for field, description in key_fields.items():
+    for field, description in KEY_FIELDS.items():
         print(f"\n{field} ({description}):")
         found_in = []
         for table, data in results.items():
-            if 'fields' in data and field in data['fields']:
+            if field in data.get('fields_set', ()):
                 found_in.append(table)
                 sample_val = data['sample'].get(field)
                 print(f"  Found in {table}: {sample_val}")
@@ -123,80 +211,79 @@ def check_key_fields(results):
             print("  NOT FOUND in any table!")
 
 
-def compare_specific_transaction():
-    """Compare a specific transaction between DB API and Submission."""
+def compare_specific_transaction(results=None):
+    """Compare a specific transaction between DB API and Submission.
+
+    Args:
+        results: Optional dict from test_db_api_tables(); its
+            reporting-owner sample saves re-fetching an accession number
+    """
     from datamule import Submission, format_accession
 
-    api_key = get_api_key()
     test_cik = 1765417
 
     print("\n" + "="*60)
     print("COMPARING DB API vs SUBMISSION APPROACH")
     print("="*60)
 
-    # Get one accession number from reporting-owner table
-    response = requests.get(
-        'https://api.datamule.xyz/insider-transactions',
-        params={
+    # Reuse the accession already downloaded during table discovery
+    accession = None
+    if results:
+        sample = results.get('reporting-owner', {}).get('sample')
+        if sample:
+            accession = sample.get('accessionNumber')
+
+    if accession is None:
+        # Get one accession number from reporting-owner table
+        reporting_data = cached_get({
             'table': 'reporting-owner',
             'rptOwnerCik': test_cik,
             'page': 1,
-            'pageSize': 1,
-            'api_key': api_key
-        },
-        timeout=30
-    )
-    response.raise_for_status()
-    reporting_data = response.json()['data'][0]
-    accession = reporting_data['accessionNumber']
+            'pageSize': 1
+        })['data'][0]
+        accession = reporting_data['accessionNumber']
 
     print(f"\nTest accession: {accession}")
 
-    # Get non-derivative transactions for this accession from DB
-    print("\n--- FROM DB API (non-derivative-transaction table) ---")
-    response = requests.get(
-        'https://api.datamule.xyz/insider-transactions',
-        params={
-            'table': 'non-derivative-transaction',
-            'accessionNumber': accession,
-            'api_key': api_key
-        },
-        timeout=30
-    )
-    response.raise_for_status()
-    db_transactions = response.json().get('data', [])
-
-    print(f"Found {len(db_transactions)} transactions")
-    if db_transactions:
-        print("First transaction fields:")
-        for k, v in sorted(db_transactions[0].items()):
-            print(f"  {k}: {v}")
-
-    # Get from metadata table
-    print("\n--- FROM DB API (metadata table) ---")
-    response = requests.get(
-        'https://api.datamule.xyz/insider-transactions',
-        params={
-            'table': 'metadata',
-            'accessionNumber': accession,
-            'api_key': api_key
-        },
-        timeout=30
-    )
-    response.raise_for_status()
-    metadata = response.json().get('data', [])
-
-    if metadata:
-        print("Metadata fields:")
-        for k, v in sorted(metadata[0].items()):
-            print(f"  {k}: {v}")
+    def fetch_table(table):
+        data = cached_get({
+            'table': table,
+            'accessionNumber': accession
+        })
+        return data.get('data', [])
 
-    # Get from Submission approach
-    print("\n--- FROM SUBMISSION APPROACH ---")
     acc_formatted = format_accession(str(accession), 'no-dash')
     url = f'https://sec-library.datamule.xyz/{acc_formatted}.sgml'
 
-    sub = Submission(url=url)
+    # The two table lookups and the SGML fetch are independent once the
+    # accession is known, so overlap their round trips and consume each
+    # result in the original print order
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        f_nd = ex.submit(fetch_table, 'non-derivative-transaction')
+        f_meta = ex.submit(fetch_table, 'metadata')
+        f_sub = ex.submit(Submission, url=url)
+
+        # Get non-derivative transactions for this accession from DB
+        print("\n--- FROM DB API (non-derivative-transaction table) ---")
+        db_transactions = f_nd.result()
+
+        print(f"Found {len(db_transactions)} transactions")
+        if db_transactions:
+            print("First transaction fields:")
+            _print_record(db_transactions[0])
+
+        # Get from metadata table
+        print("\n--- FROM DB API (metadata table) ---")
+        metadata = f_meta.result()
+
+        if metadata:
+            print("Metadata fields:")
+            _print_record(metadata[0])
+
+        # Get from Submission approach
+        print("\n--- FROM SUBMISSION APPROACH ---")
+        sub = f_sub.result()
+
     for doc in sub:
         if doc.type in ['4', '4/A']:
             ownership_doc = doc.data.get('ownershipDocument', {})
@@ -209,7 +296,7 @@ def compare_specific_transaction():
             print(f"Found {len(nd_transactions)} transactions")
             if nd_transactions:
                 print("\nFirst transaction (full structure):")
-                print(json.dumps(nd_transactions[0], indent=2, default=str))
+                print(_json_pretty(nd_transactions[0]))
             break
 
 
@@ -223,5 +310,5 @@ if __name__ == '__main__':
     # Check key fields
     check_key_fields(results)
 
-    # Compare specific transaction
-    compare_specific_transaction()
+    # Compare specific transaction, reusing the discovery results
+    compare_specific_transaction(results)